@@ -1,56 +1,132 @@
 """Configuration settings for the application."""
 
-from typing import List, Optional, Dict
-from pydantic_settings import BaseSettings
-from pydantic import Field, BaseModel
+import hashlib
+import json
+import os
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Any, Optional, Dict, Tuple, Type
+from pydantic_settings import (
+    BaseSettings,
+    DotEnvSettingsSource,
+    EnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+from pydantic import Field, PrivateAttr
+from pydantic.fields import FieldInfo
 from version import __version__ as MCP_VERSION
 
-class ProjectSettings(BaseModel):
-    id: str = Field(..., description="GCP Project ID")
-    region: str = Field(..., description="GCP Region")
-    billing_account: Optional[str] = Field(None, description="GCP Billing Account ID")
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
 
-class ThresholdSettings(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ProjectSettings:
+    id: str  # GCP Project ID
+    region: str  # GCP Region
+    billing_account: Optional[str] = None  # GCP Billing Account ID
+
+@dataclass(slots=True, frozen=True)
+class ThresholdSettings:
     daily_cost_alert: float = 1000.0
     query_cost_warning: float = 50.0
     anomaly_sensitivity: str = "medium"  # low, medium, high
 
-class OptimizationSettings(BaseModel):
+@dataclass(slots=True, frozen=True)
+class OptimizationSettings:
     min_savings_for_pr: float = 100.0
     auto_optimize_threshold: float = 25.0
     max_risk_level: str = "medium"  # low, medium, high
 
-class GithubIntegration(BaseModel):
+@dataclass(slots=True, frozen=True)
+class GithubIntegration:
     repository: str = "quantium/data-platform"
-    default_reviewers: List[str] = ["data-engineering-team"]
+    default_reviewers: Tuple[str, ...] = ("data-engineering-team",)
 
-class SlackIntegration(BaseModel):
+@dataclass(slots=True, frozen=True)
+class SlackIntegration:
     default_channel: str = "#data-ops-alerts"
     critical_channel: str = "#data-ops-critical"
 
-class IntegrationsSettings(BaseModel):
+@dataclass(slots=True, frozen=True)
+class IntegrationsSettings:
     github: Optional[GithubIntegration] = None
     slack: Optional[SlackIntegration] = None
 
-class CostGuardAgent(BaseModel):
+@dataclass(slots=True, frozen=True)
+class CostGuardAgent:
     enabled: bool = True
     monitoring_interval: int = 300
     auto_alert: bool = True
 
-class QueryOptimizerAgent(BaseModel):
+@dataclass(slots=True, frozen=True)
+class QueryOptimizerAgent:
     enabled: bool = True
     auto_optimize: bool = False
     ai_model: str = "claude-3-sonnet"
 
-class SlaSentinelAgent(BaseModel):
+@dataclass(slots=True, frozen=True)
+class SlaSentinelAgent:
     enabled: bool = True
     sla_threshold: float = 0.95
 
-class AgentsSettings(BaseModel):
+@dataclass(slots=True, frozen=True)
+class AgentsSettings:
     cost_guard: Optional[CostGuardAgent] = None
     query_optimizer: Optional[QueryOptimizerAgent] = None
     sla_sentinel: Optional[SlaSentinelAgent] = None
 
+# Secrets are only needed by the integrations that use them, so they are not
+# declared as model fields and are resolved from the sources on first access.
+_DEFERRED_FIELDS: Dict[str, FieldInfo] = {
+    "GITHUB_TOKEN": FieldInfo(annotation=Optional[str], default=None),
+    "SLACK_WEBHOOK_URL": FieldInfo(annotation=Optional[str], default=None),
+    "CLAUDE_API_KEY": FieldInfo(annotation=Optional[str], default=None),
+}
+
+class LazySettingsSource(PydanticBaseSettingsSource):
+    """Wrap a settings source so deferred fields can be resolved on demand."""
+
+    def __init__(self, source: PydanticBaseSettingsSource, deferred: Dict[str, FieldInfo]):
+        super().__init__(source.settings_cls)
+        self.source = source
+        self.deferred = deferred
+        self._deferred_keys = frozenset(name.lower() for name in deferred)
+
+    def get_field_value(self, field: FieldInfo, field_name: str) -> Tuple[Any, str, bool]:
+        return self.source.get_field_value(field, field_name)
+
+    def resolve(self, field_name: str) -> Any:
+        """Look up a single deferred field in the wrapped source."""
+        field = self.deferred[field_name]
+        value, _, value_is_complex = self.source.get_field_value(field, field_name)
+        return self.source.prepare_field_value(field_name, field, value, value_is_complex)
+
+    def __call__(self) -> Dict[str, Any]:
+        # Deferred fields would otherwise be picked up as model extras
+        return {
+            key: value for key, value in self.source().items()
+            if key.lower() not in self._deferred_keys
+        }
+
+def _wrap_lazy_sources(*sources: PydanticBaseSettingsSource) -> tuple[LazySettingsSource, ...]:
+    """Wrap the sources deferred fields are resolved from."""
+    return tuple(LazySettingsSource(source, _DEFERRED_FIELDS) for source in sources)
+
+# Lazy sources of the Settings() call in progress, handed from
+# settings_customise_sources (a classmethod) back to that instance's __init__
+_building_lazy_sources: ContextVar[tuple[LazySettingsSource, ...]] = ContextVar(
+    "_building_lazy_sources", default=()
+)
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables or .env file."""
 
@@ -58,15 +134,12 @@ class Settings(BaseSettings):
     project: ProjectSettings
     GOOGLE_APPLICATION_CREDENTIALS: str
 
-    # Integrations
+    # Integrations (GITHUB_TOKEN, SLACK_WEBHOOK_URL and CLAUDE_API_KEY are deferred)
     integrations: Optional[IntegrationsSettings] = None
-    GITHUB_TOKEN: Optional[str] = None
-    SLACK_WEBHOOK_URL: Optional[str] = None
-    CLAUDE_API_KEY: Optional[str] = None
 
     # Thresholds and Optimization
-    thresholds: ThresholdSettings = ThresholdSettings()
-    optimization: OptimizationSettings = OptimizationSettings()
+    thresholds: ThresholdSettings = Field(default_factory=ThresholdSettings)
+    optimization: OptimizationSettings = Field(default_factory=OptimizationSettings)
 
     # Agents
     agents: Optional[AgentsSettings] = None
@@ -77,9 +150,151 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_QUERIES: int = 5
     ENABLE_DETAILED_LOGGING: bool = False
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        extra = "allow"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="allow",
+        case_sensitive=False,
+        defer_build=False,
+    )
+
+    _lazy_sources: tuple[LazySettingsSource, ...] = PrivateAttr(default=())
+
+    def __init__(self, **values: Any) -> None:
+        token = _building_lazy_sources.set(())
+        try:
+            super().__init__(**values)
+            self._lazy_sources = _building_lazy_sources.get()
+        finally:
+            _building_lazy_sources.reset(token)
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: Type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        lazy_sources = _wrap_lazy_sources(env_settings, dotenv_settings)
+        _building_lazy_sources.set(lazy_sources)
+        return (init_settings, *lazy_sources, file_secret_settings)
+
+    def _resolve_deferred(self, field_name: str) -> Optional[str]:
+        for source in self._lazy_sources:
+            value = source.resolve(field_name)
+            if value is not None:
+                return value
+        return None
+
+    @cached_property
+    def GITHUB_TOKEN(self) -> Optional[str]:
+        return self._resolve_deferred("GITHUB_TOKEN")
+
+    @cached_property
+    def SLACK_WEBHOOK_URL(self) -> Optional[str]:
+        return self._resolve_deferred("SLACK_WEBHOOK_URL")
+
+    @cached_property
+    def CLAUDE_API_KEY(self) -> Optional[str]:
+        return self._resolve_deferred("CLAUDE_API_KEY")
+
+
+def _settings_cache_dir() -> Path:
+    """Per-user directory for the settings cache, created private to the user."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    cache_dir = Path(base) / "dataops-mcp-server"
+    cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    return cache_dir
+
+def _cached_settings_path() -> Path:
+    """Path of the settings cache for the current .env file and environment.
+
+    The name changes whenever the .env mtime or any environment variable that
+    maps to a Settings field changes, which invalidates older cache files.
+    """
+    env_file = Path(Settings.model_config["env_file"])
+    env_mtime = env_file.stat().st_mtime_ns if env_file.exists() else 0
+
+    field_names = {name.lower() for name in Settings.model_fields}
+    env_items = sorted(
+        (key.lower(), value) for key, value in os.environ.items()
+        if key.lower().split("__", 1)[0] in field_names
+    )
+    digest = hashlib.blake2b(
+        repr((MCP_VERSION, str(env_file.resolve()), env_mtime, env_items)).encode(),
+        digest_size=16,
+    ).hexdigest()
+    return _settings_cache_dir() / f"settings_{digest}.json"
+
+def _settings_from_cache(data: Dict[str, Any]) -> Settings:
+    """Rebuild Settings from previously validated data without re-validating.
+
+    model_construct skips settings_customise_sources, so the env and .env
+    sources used for deferred secrets are set up here instead.
+    """
+    data = dict(data)
+    data["project"] = ProjectSettings(**data["project"])
+    data["thresholds"] = ThresholdSettings(**data["thresholds"])
+    data["optimization"] = OptimizationSettings(**data["optimization"])
+
+    integrations = data.get("integrations")
+    if integrations:
+        github = integrations.get("github")
+        if github:
+            github = GithubIntegration(
+                repository=github["repository"],
+                default_reviewers=tuple(github["default_reviewers"]),
+            )
+        slack = integrations.get("slack")
+        data["integrations"] = IntegrationsSettings(
+            github=github,
+            slack=SlackIntegration(**slack) if slack else None,
+        )
+
+    agents = data.get("agents")
+    if agents:
+        data["agents"] = AgentsSettings(
+            cost_guard=CostGuardAgent(**agents["cost_guard"]) if agents.get("cost_guard") else None,
+            query_optimizer=(
+                QueryOptimizerAgent(**agents["query_optimizer"])
+                if agents.get("query_optimizer") else None
+            ),
+            sla_sentinel=(
+                SlaSentinelAgent(**agents["sla_sentinel"]) if agents.get("sla_sentinel") else None
+            ),
+        )
+
+    settings = Settings.model_construct(**data)
+    settings._lazy_sources = _wrap_lazy_sources(EnvSettingsSource(Settings), DotEnvSettingsSource(Settings))
+    return settings
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance.
+
+    Settings are read from the environment and .env file once; subsequent
+    calls reuse the same validated object instead of re-parsing. Validated
+    values are also cached on disk, so later processes skip validation until
+    the .env file or relevant environment variables change. Only declared
+    fields are written to the cache: deferred secrets are read from the
+    environment on access and undeclared extras are not kept on a warm start.
+    """
+    try:
+        cache_path = _cached_settings_path()
+        return _settings_from_cache(_loads(cache_path.read_bytes()))
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # Missing or stale cache; validate from scratch
 
+    settings = Settings()
+    try:
+        cache_path = _cached_settings_path()
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(_dumps(settings.model_dump(mode="json", include=set(Settings.model_fields))))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Caching is best effort
+    return settings
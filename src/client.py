@@ -9,401 +9,885 @@ Usage: python client.py <tool_name> [options]
 """
 
 import argparse
-import asyncio
-import json
+import importlib
+import re
 import sys
 import os
-from pathlib import Path
+from collections.abc import Coroutine
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
 
-# Add both the servers and tools directories to path
-servers_path = Path(__file__).parent / 'dataops-mcp-server' / 'servers'
-tools_path = Path(__file__).parent / 'dataops-mcp-server' / 'tools'
-dataops_path = Path(__file__).parent / 'dataops-mcp-server'
+# asyncio, json and the tool modules are imported only once a tool is
+# dispatched, so --help and argument errors never pay for them.
+try:
+    import orjson
 
-sys.path.insert(0, str(servers_path))
-sys.path.insert(0, str(tools_path))  
-sys.path.insert(0, str(dataops_path))
+    _loads = orjson.loads
 
-async def run_get_costs(args):
+    def _dumps(obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+except ImportError:
+    def _loads(data):
+        import json
+        return json.loads(data)
+
+    def _dumps(obj, indent=False):
+        import json
+        return json.dumps(obj, indent=2 if indent else None)
+
+_DEFAULT_PROJECT = "gcp-wow-wiq-tsr-dev"
+_CATEGORIZE_CHOICES = ("cost_driver", "usage_pattern", "optimization_opportunity")
+_GROWTH_CHOICES = ("current_trend", "conservative", "aggressive")
+_REPORT_CHOICES = ("executive", "technical", "stakeholder")
+
+_INSIGHT_RE = re.compile(r"insights|recommendation", re.IGNORECASE)
+
+# The tool modules (bigquery_core, bigquery_wrapper, bigquery_client) live in the tools
+# directory; bigquery_core adds the dataops-mcp-server directory itself.
+_SRC_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'dataops-mcp-server', 'tools'
+)
+if _SRC_PATH not in sys.path:
+    sys.path.insert(0, _SRC_PATH)
+
+
+class _UnavailableModule:
+    """Placeholder for a tool module that failed to import.
+
+    Attribute access re-raises the original error so each handler reports it
+    the same way it did when the import lived inside the handler.
+    """
+
+    def __init__(self, error):
+        self._error = error
+
+    def __getattr__(self, name):
+        raise self._error
+
+
+class _LazyModule:
+    """Stand-in for a tool module that imports it on first attribute access.
+
+    Modelled on TensorFlow's LazyLoader: handlers use the module-level name as
+    if it were imported eagerly, and once loaded the real module replaces this
+    object in the parent globals. An import failure is kept and re-raised on
+    every attribute access (see _UnavailableModule).
+
+    bigquery_core reads GOOGLE_CLOUD_PROJECT and creates its client at import
+    time, so no attribute may be touched before main() has set the project.
+    """
+
+    def __init__(self, local_name, parent_globals, name):
+        self._local_name = local_name
+        self._parent_globals = parent_globals
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self._name)
+            except Exception as e:  # import also initialises the BigQuery client
+                self._module = _UnavailableModule(e)
+            else:
+                self._parent_globals[self._local_name] = self._module
+        return self._module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+bigquery_core = _LazyModule("bigquery_core", globals(), "bigquery_core")
+bigquery_wrapper = _LazyModule("bigquery_wrapper", globals(), "bigquery_wrapper")
+bigquery_client = _LazyModule("bigquery_client", globals(), "bigquery_client")
+
+# ToolSpec and cache keys name modules by string
+_TOOL_MODULES = {
+    "bigquery_core": bigquery_core,
+    "bigquery_wrapper": bigquery_wrapper,
+    "bigquery_client": bigquery_client,
+}
+
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "dataops-mcp")
+_DEFAULT_CACHE_TTL = 300  # seconds
+
+def _cache_path(project, tool, kwargs):
+    """Cache file for one (project, tool, kwargs) combination."""
+    import hashlib
+    key = f"{tool}|{project}|{sorted(kwargs.items())}"
+    digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return os.path.join(_CACHE_DIR, f"{digest}.json")
+
+def _cache_get(path, ttl):
+    """Return the cached result at path if it is younger than ttl seconds.
+
+    Unreadable or malformed entries count as a miss.
+    """
+    import time
+    try:
+        with open(path, "rb") as f:
+            entry = _loads(f.read())
+        if time.time() - entry["ts"] > ttl:
+            return None
+        return entry["value"]
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+def _cache_put(path, value):
+    """Store a result on disk; caching is best effort.
+
+    Results can hold query text, user emails and costs, so the directory is
+    private to the user and entries are written 0600 via an atomic replace.
+    """
+    import time
+    try:
+        os.makedirs(_CACHE_DIR, mode=0o700, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(_dumps({"ts": time.time(), "value": value}))
+        os.replace(tmp_path, path)
+    except (OSError, TypeError):
+        pass
+
+def _is_cacheable(result):
+    """Only cache successful JSON string results, never error responses."""
+    if not isinstance(result, str):
+        return False
+    try:
+        data = _loads(result)
+    except ValueError:
+        return True
+    return not (isinstance(data, dict) and (data.get("success") is False or "error" in data))
+
+def _call_tool(args, module, func_name, **kwargs):
+    """Call a tool module function, going through the on-disk result cache.
+
+    Results are keyed by project, tool function and arguments and reused for
+    --cache-ttl seconds unless --no-cache is given.
+    """
+    if args.no_cache:
+        return getattr(_TOOL_MODULES[module], func_name)(**kwargs)
+
+    path = _cache_path(args.project, f"{module}.{func_name}", kwargs)
+    cached = _cache_get(path, args.cache_ttl)
+    if cached is not None:
+        return cached
+
+    result = getattr(_TOOL_MODULES[module], func_name)(**kwargs)
+    if _is_cacheable(result):
+        _cache_put(path, result)
+    return result
+
+def _write_result(result):
+    """Write a tool result to stdout without print()'s per-call overhead.
+
+    Tools return pretty-printed JSON strings, which are written as-is; anything
+    else is pretty-printed first.
+    """
+    sys.stdout.write(result if isinstance(result, str) else _dumps(result, indent=True))
+    sys.stdout.write("\n")
+
+def _write_banner(args, *lines):
+    """Write banner lines with a single write unless --quiet was given."""
+    if not args.quiet:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+def run_get_costs(args):
     """Enhanced cost analysis using bigquery_core.py."""
-    if args.details:
-        # Use get_cost_summary for comprehensive analysis with insights
-        result = await call_mcp_tool(
-            args, 
-            bigquery_core, 
-            "get_cost_summary", 
-            {
-                "project_id": args.project,
-                "days": args.days
-            }
-        )
-        
-        if result:
-            print("🎯 === BIGQUERY COST SUMMARY WITH INSIGHTS ===")
-            print(f"Analysis Period: {args.days} days")
-            print()
+    try:
+        if args.details:
+            # Use get_cost_summary for comprehensive analysis with insights
+            result = _call_tool(args, "bigquery_core", "get_cost_summary", days=args.days)
             
-            # Extract and display key metrics
-            content = result.get("content", "No data available")
+            if result:
+                _write_banner(args, "🎯 === BIGQUERY COST SUMMARY WITH INSIGHTS ===",
+                              f"Analysis Period: {args.days} days", "")
+                
+                # Enhanced formatting for insights
+                if _INSIGHT_RE.search(result):
+                    _write_banner(args, "� === KEY INSIGHTS & RECOMMENDATIONS ===")
+                else:
+                    _write_banner(args, "📊 === COST ANALYSIS RESULTS ===")
+                _write_result(result)
+        else:
+            # Use get_daily_costs for standard daily analysis
+            result = _call_tool(args, "bigquery_core", "get_daily_costs", days=args.days)
             
-            # Enhanced formatting for insights
-            if "insights" in content.lower() or "recommendation" in content.lower():
-                print("� === KEY INSIGHTS & RECOMMENDATIONS ===")
-                print(content)
-            else:
-                print("📊 === COST ANALYSIS RESULTS ===")
-                print(content)
-    else:
-        # Use get_daily_costs for standard daily analysis
-        result = await call_mcp_tool(
-            args, 
-            bigquery_core, 
-            "get_daily_costs", 
-            {
-                "project_id": args.project,
-                "days": args.days
-            }
-        )
+            if result:
+                _write_banner(args, "📊 === DAILY BIGQUERY COSTS ===", f"Period: Last {args.days} days", "")
+                _write_result(result)
         
-        if result:
-            print("📊 === DAILY BIGQUERY COSTS ===")
-            print(f"Period: Last {args.days} days")
-            print()
-            print(result.get("content", "No data available"))
-    
-    print(f"\n✅ Cost analysis complete (Enhanced by bigquery_core.py)")
+        _write_banner(args, "\n✅ Cost analysis complete (Enhanced by bigquery_core.py)")
+        
+    except Exception as e:
+        print(f"❌ Failed to get costs: {e}")
+        return False
 
-async def run_top_users(args):
+def run_top_users(args):
     """Run top users analysis using new bigquery_core architecture."""
     try:
-        # Set environment variable for the core module
-        os.environ["GOOGLE_CLOUD_PROJECT"] = args.project
-        
-        # Import from bigquery_core
-        from bigquery_core import get_top_users
-        
-        result = get_top_users(args.days, args.limit)
-        result_data = json.loads(result)
-        
-        print("👥 Top BigQuery Users:")
-        print(json.dumps(result_data, indent=2))
+        result = _call_tool(args, "bigquery_core", "get_top_users",
+                            days=args.days, limit=args.limit)
+        _write_banner(args, "👥 Top BigQuery Users:")
+        _write_result(result)  # already pretty-printed JSON from create_standard_response
+        result_data = _loads(result)
         
         # Show quick summary
         if result_data.get("success") and "data" in result_data:
             summary = result_data["data"].get("summary", {})
-            print(f"\n👑 Quick Summary:")
-            print(f"   Users Analyzed: {summary.get('unique_users', 0)}")
-            print(f"   Total Cost: ${summary.get('total_analyzed_cost', 0):.2f}")
-            print(f"   Avg Cost per User: ${summary.get('cost_per_user_avg', 0):.2f}")
+            _write_banner(
+                args,
+                "\n👑 Quick Summary:",
+                f"   Users Analyzed: {summary.get('unique_users', 0)}",
+                f"   Total Cost: ${summary.get('total_analyzed_cost', 0):.2f}",
+                f"   Avg Cost per User: ${summary.get('cost_per_user_avg', 0):.2f}",
+            )
         
     except Exception as e:
         print(f"❌ Failed to get top users: {e}")
+        return False
 
-async def run_service_account_analysis(args):
-    """Run service account analysis using legacy wrapper (for now)."""
-    try:
-        from bigquery_wrapper import bigquery_cost_analyzer
-        
-        result = bigquery_cost_analyzer(
-            project_id=args.project,
-            days=args.days,
-            service_account_filter=args.filter or "",
-            include_query_text=args.include_queries,
-            min_cost_threshold=args.min_cost
-        )
-        
-        print("🔍 Service Account Analysis Results:")
-        print(result)
-        
-    except Exception as e:
-        print(f"❌ Failed to run service account analysis: {e}")
+@dataclass(frozen=True)
+class ToolSpec:
+    """How to run a tool that calls one module function and prints its result."""
+    module: str
+    func: str
+    header: str
+    error: str
+    kwargs: Callable[[argparse.Namespace], Dict[str, Any]]
+    # Optional generator variant used with --stream: (module, function name, kwargs builder)
+    stream: Optional[Tuple[str, str, Callable[[argparse.Namespace], Dict[str, Any]]]] = None
 
-async def run_expensive_queries_analysis(args):
-    """Run expensive queries analysis using legacy wrapper."""
-    try:
-        from bigquery_wrapper import analyze_expensive_queries
-        
-        result = analyze_expensive_queries(
-            project_id=args.project,
-            days=args.days,
-            min_cost_threshold=args.min_cost,
-            categorize_by=args.categorize_by
-        )
-        
-        print("💰 Expensive Queries Analysis Results:")
-        print(result)
-        
-    except Exception as e:
-        print(f"❌ Failed to analyze expensive queries: {e}")
+def _report_tool(spec, args, result, error=None):
+    """Print a ToolSpec tool's header and result, or its failure message.
+
+    Returns False when reporting a failure, like the tool handlers.
+    """
+    if error is not None:
+        print(f"❌ {spec.error}: {error}")
+        return False
+    _write_banner(args, spec.header)
+    _write_result(result)
+    return True
+
+def _stream_tool(spec, args):
+    """Write a tool's rows as JSON lines as its generator variant yields them."""
+    module, func_name, build_kwargs = spec.stream
+    rows = getattr(_TOOL_MODULES[module], func_name)(**build_kwargs(args))
+    _write_banner(args, spec.header)
+    for row in rows:
+        sys.stdout.write(_dumps(row))
+        sys.stdout.write("\n")
+
+def run_tool(spec, args):
+    """Run a ToolSpec-described tool: call the function, print header and result."""
+    if spec.stream and getattr(args, "stream", False):
+        try:
+            _stream_tool(spec, args)
+        except Exception as e:
+            return _report_tool(spec, args, None, e)
+        return True
 
-async def run_optimization_patterns(args):
-    """Run optimization patterns detection using legacy wrapper."""
     try:
-        from bigquery_wrapper import detect_optimization_patterns
-        
-        result = detect_optimization_patterns(
-            project_id=args.project,
-            days=args.days,
-            min_cost_threshold=args.min_cost
-        )
-        
-        print("🔍 Optimization Patterns Analysis Results:")
-        print(result)
-        
+        result = _call_tool(args, spec.module, spec.func, **spec.kwargs(args))
     except Exception as e:
-        print(f"❌ Failed to detect optimization patterns: {e}")
+        return _report_tool(spec, args, None, e)
+    return _report_tool(spec, args, result)
+
+SERVICE_ACCOUNTS = ToolSpec(
+    module="bigquery_wrapper",
+    func="bigquery_cost_analyzer",
+    header="🔍 Service Account Analysis Results:",
+    error="Failed to run service account analysis",
+    kwargs=lambda a: {
+        "project_id": a.project,
+        "days": a.days,
+        "service_account_filter": a.filter or "",
+        "include_query_text": a.include_queries,
+        "min_cost_threshold": a.min_cost,
+    },
+)
+
+EXPENSIVE_QUERIES = ToolSpec(
+    module="bigquery_wrapper",
+    func="analyze_expensive_queries",
+    header="💰 Expensive Queries Analysis Results:",
+    error="Failed to analyze expensive queries",
+    kwargs=lambda a: {
+        "project_id": a.project,
+        "days": a.days,
+        "min_cost_threshold": a.min_cost,
+        "categorize_by": a.categorize_by,
+    },
+    stream=(
+        "bigquery_client",
+        "iter_expensive_queries",
+        lambda a: {"project_id": a.project, "days": a.days, "min_cost_threshold": a.min_cost},
+    ),
+)
+
+OPTIMIZATION_PATTERNS = ToolSpec(
+    module="bigquery_wrapper",
+    func="detect_optimization_patterns",
+    header="🔍 Optimization Patterns Analysis Results:",
+    error="Failed to detect optimization patterns",
+    kwargs=lambda a: {"project_id": a.project, "days": a.days, "min_cost_threshold": a.min_cost},
+)
+
+COST_FORECAST = ToolSpec(
+    module="bigquery_wrapper",
+    func="create_cost_forecast",
+    header="📈 Cost Forecast Results:",
+    error="Failed to generate cost forecast",
+    kwargs=lambda a: {
+        "project_id": a.project,
+        "days_historical": a.historical_days,
+        "days_forecast": a.forecast_days,
+        "growth_assumptions": a.growth or "current_trend",
+    },
+)
+
+TABLE_HOTSPOTS = ToolSpec(
+    module="bigquery_wrapper",
+    func="analyze_table_hotspots",
+    header="🔥 Table Hotspots Analysis Results:",
+    error="Failed to analyze table hotspots",
+    kwargs=lambda a: {"project_id": a.project, "days": a.days, "min_access_cost": a.min_cost},
+)
+
+MATERIALIZED_VIEWS = ToolSpec(
+    module="bigquery_wrapper",
+    func="generate_materialized_view_recommendations",
+    header="🏗️ Materialized View Recommendations:",
+    error="Failed to generate materialized view recommendations",
+    kwargs=lambda a: {
+        "project_id": a.project,
+        "days": a.days,
+        "min_repetition_count": a.min_repetitions,
+        "min_cost_per_execution": a.min_cost,
+    },
+)
+
+OPTIMIZATION_REPORT = ToolSpec(
+    module="bigquery_wrapper",
+    func="create_optimization_report",
+    header="📊 Optimization Report:",
+    error="Failed to generate optimization report",
+    kwargs=lambda a: {
+        "project_id": a.project,
+        "days": a.days,
+        "report_type": a.report_type or "executive",
+    },
+)
+
+# Independent analyses stitched into a report by optimization-report --parallel:
+# (section name, CLI tool name, ToolSpec)
+_REPORT_SECTIONS = (
+    ("expensive_queries", "expensive-queries", EXPENSIVE_QUERIES),
+    ("table_hotspots", "table-hotspots", TABLE_HOTSPOTS),
+    ("optimization_patterns", "optimization-patterns", OPTIMIZATION_PATTERNS),
+    ("materialized_views", "materialized-views", MATERIALIZED_VIEWS),
+)
+
+def _section_args(args, tool):
+    """Args for a report section: the tool's own CLI defaults, with the report's project and days."""
+    section_args, _ = _parse_command(tool, ["--project", args.project, tool, "--days", str(args.days)])
+    return section_args
+
+async def _run_optimization_report_parallel(args):
+    """Build the optimization report client-side from concurrent analyses.
+
+    Each section is a blocking BigQuery round trip, so the calls run in worker
+    threads and the report waits only as long as the slowest one. The result
+    is not the audience-specific report the sequential path returns, so
+    --report-type does not apply. It is printed as
+    {"project_id", "days", "sections": {name: tool result}}. A failed
+    section is {"success": false, "error": ...}.
+    """
+    import asyncio
 
-async def run_analyze_query(args):
+    if args.report_type is not None:
+        print("❌ --report-type applies to the sequential report and cannot be used with --parallel")
+        return False
+
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(_call_tool, args, spec.module, spec.func,
+                              **spec.kwargs(_section_args(args, tool)))
+            for _, tool, spec in _REPORT_SECTIONS
+        ),
+        return_exceptions=True,
+    )
+
+    sections = {}
+    for (name, _, spec), result in zip(_REPORT_SECTIONS, results, strict=True):
+        if isinstance(result, Exception):
+            sections[name] = {"success": False, "error": f"{spec.error}: {result}"}
+            continue
+        try:
+            sections[name] = _loads(result) if isinstance(result, str) else result
+        except ValueError:
+            sections[name] = result
+
+    _write_banner(args, OPTIMIZATION_REPORT.header)
+    _write_result({"project_id": args.project, "days": args.days, "sections": sections})
+    return not any(isinstance(result, Exception) for result in results)
+
+def run_optimization_report(args):
+    """Run optimization-report, or stitch it from parallel analyses with --parallel."""
+    if args.parallel:
+        return _run_optimization_report_parallel(args)
+    return run_tool(OPTIMIZATION_REPORT, args)
+
+def run_analyze_query(args):
     """Query analysis not available - suggest alternatives."""
-    print("❌ Individual query analysis not available in current version")
-    print("💡 Available alternatives:")
-    print("  • Use 'costs --details' for comprehensive cost analysis")
-    print("  • Use 'expensive-queries' to find costly query patterns")
-    print("  • Use 'optimization-patterns' for query optimization suggestions")
+    sys.stdout.write(
+        "❌ Individual query analysis not available in current version\n"
+        "💡 Available alternatives:\n"
+        "  • Use 'costs --details' for comprehensive cost analysis\n"
+        "  • Use 'expensive-queries' to find costly query patterns\n"
+        "  • Use 'optimization-patterns' for query optimization suggestions\n"
+    )
+    return False
 
-async def run_health_check(args):
+def run_health_check(args):
     """Run health check using new bigquery_core architecture."""
     try:
-        # Set environment variable for the core module
-        os.environ["GOOGLE_CLOUD_PROJECT"] = args.project
-        
-        # Import from bigquery_core
-        from bigquery_core import health_check
-        
-        result = health_check()
-        result_data = json.loads(result)
-        
-        print("🏥 Health Check Results:")
-        print(json.dumps(result_data, indent=2))
+        result = bigquery_core.health_check()
+        _write_banner(args, "🏥 Health Check Results:")
+        _write_result(result)
+        result_data = _loads(result)
         
         # Show quick status
         if result_data.get("success"):
             print("\n✅ BigQuery connectivity: HEALTHY")
-        else:
-            print("\n❌ BigQuery connectivity: UNHEALTHY")
-            if "data" in result_data and "suggestions" in result_data["data"]:
-                print("💡 Suggestions:")
-                for suggestion in result_data["data"]["suggestions"]:
-                    print(f"   • {suggestion}")
+            return True
+        print("\n❌ BigQuery connectivity: UNHEALTHY")
+        if "data" in result_data and "suggestions" in result_data["data"]:
+            print("💡 Suggestions:")
+            for suggestion in result_data["data"]["suggestions"]:
+                print(f"   • {suggestion}")
+        return False
         
     except Exception as e:
         print(f"❌ Health check failed: {e}")
+        return False
 
-async def run_cost_forecast(args):
-    """Run cost forecast using legacy wrapper."""
-    try:
-        from bigquery_wrapper import create_cost_forecast
-        
-        result = create_cost_forecast(
-            project_id=args.project,
-            days_historical=args.historical_days,
-            days_forecast=args.forecast_days,
-            growth_assumptions=args.growth or "current_trend"
-        )
-        
-        print("📈 Cost Forecast Results:")
-        print(result)
-        
-    except Exception as e:
-        print(f"❌ Failed to generate cost forecast: {e}")
-
-async def run_table_hotspots(args):
-    """Run table hotspots analysis using legacy wrapper."""
-    try:
-        from bigquery_wrapper import analyze_table_hotspots
-        
-        result = analyze_table_hotspots(
-            project_id=args.project,
-            days=args.days,
-            min_access_cost=args.min_cost
-        )
-        
-        print("🔥 Table Hotspots Analysis Results:")
-        print(result)
-        
-    except Exception as e:
-        print(f"❌ Failed to analyze table hotspots: {e}")
-
-async def run_materialized_views(args):
-    """Run materialized view recommendations using legacy wrapper."""
-    try:
-        from bigquery_wrapper import generate_materialized_view_recommendations
-        
-        result = generate_materialized_view_recommendations(
-            project_id=args.project,
-            days=args.days,
-            min_repetition_count=args.min_repetitions,
-            min_cost_per_execution=args.min_cost
-        )
-        
-        print("🏗️ Materialized View Recommendations:")
-        print(result)
-        
-    except Exception as e:
-        print(f"❌ Failed to generate materialized view recommendations: {e}")
-
-async def run_optimization_report(args):
-    """Run comprehensive optimization report using legacy wrapper."""
-    try:
-        from bigquery_wrapper import create_optimization_report
-        
-        result = create_optimization_report(
-            project_id=args.project,
-            days=args.days,
-            report_type=args.report_type
-        )
-        
-        print("📊 Optimization Report:")
-        print(result)
-        
-    except Exception as e:
-        print(f"❌ Failed to generate optimization report: {e}")
+def _add_health(subparsers):
+    subparsers.add_parser("health", help="🏥 Check BigQuery connectivity")
 
-def main():
-    """Main CLI function with updated architecture."""
-    parser = argparse.ArgumentParser(
-        description="BigQuery Analysis CLI - Enhanced with BigQuery Core",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Architecture:
-  Core Tools (bigquery_core.py):    health, costs, top-users  
-  Advanced Tools (bigquery_wrapper.py): service-accounts, expensive-queries, etc.
-
-Examples:
-  python client.py health --project my-project
-  python client.py costs --days 14 --details
-  python client.py top-users --limit 20
-  python client.py service-accounts --filter my-sa
-        """
-    )
-    parser.add_argument("--project", default="gcp-wow-wiq-tsr-dev", help="GCP Project ID")
-    
-    subparsers = parser.add_subparsers(dest="tool", help="Available analysis tools")
-    
-    # === CORE TOOLS (bigquery_core.py) ===
-    # Health check
-    health_parser = subparsers.add_parser("health", help="🏥 Check BigQuery connectivity")
-    
-    # Core cost analysis 
+def _add_costs(subparsers):
     costs_parser = subparsers.add_parser("costs", help="📊 Daily cost analysis (ENHANCED)")
     costs_parser.add_argument("--days", type=int, default=7, help="Number of days to analyze")
     costs_parser.add_argument("--details", action="store_true", help="Get comprehensive cost summary with insights")
-    
-    # Top users analysis
+
+def _add_top_users(subparsers):
     users_parser = subparsers.add_parser("top-users", help="👥 Top BigQuery users by cost (ENHANCED)")
     users_parser.add_argument("--days", type=int, default=7, help="Number of days to analyze")
     users_parser.add_argument("--limit", type=int, default=10, help="Number of top users to show")
-    
-    # === ADVANCED TOOLS (bigquery_wrapper.py) ===
-    # Service account analysis
+
+def _add_service_accounts(subparsers):
     sa_parser = subparsers.add_parser("service-accounts", help="🔍 Service account cost analysis")
     sa_parser.add_argument("--days", type=int, default=7, help="Number of days to analyze")
     sa_parser.add_argument("--filter", help="Service account email filter (partial match)")
     sa_parser.add_argument("--include-queries", action="store_true", help="Include query text")
     sa_parser.add_argument("--min-cost", type=float, default=0.0, help="Minimum cost threshold")
-    
-    # Expensive queries analysis
+
+def _add_expensive_queries(subparsers):
     eq_parser = subparsers.add_parser("expensive-queries", help="💰 Expensive queries analysis")
     eq_parser.add_argument("--days", type=int, default=7, help="Number of days to analyze")
     eq_parser.add_argument("--min-cost", type=float, default=10.0, help="Minimum cost threshold")
     eq_parser.add_argument("--categorize-by", default="cost_driver", 
-                          choices=["cost_driver", "usage_pattern", "optimization_opportunity"],
+                          choices=_CATEGORIZE_CHOICES,
                           help="Categorization method")
-    
-    # Optimization patterns
+    eq_parser.add_argument("--stream", action="store_true",
+                          help="Print each query as a JSON line as results arrive")
+
+def _add_optimization_patterns(subparsers):
     op_parser = subparsers.add_parser("optimization-patterns", help="🔍 Query optimization patterns")
     op_parser.add_argument("--days", type=int, default=7, help="Number of days to analyze")
     op_parser.add_argument("--min-cost", type=float, default=5.0, help="Minimum cost threshold")
-    
-    # Cost forecasting
+
+def _add_cost_forecast(subparsers):
     cf_parser = subparsers.add_parser("cost-forecast", help="📈 Cost forecasting")
     cf_parser.add_argument("--historical-days", type=int, default=30, help="Historical data days")
     cf_parser.add_argument("--forecast-days", type=int, default=30, help="Days to forecast")
-    cf_parser.add_argument("--growth", choices=["current_trend", "conservative", "aggressive"], 
+    cf_parser.add_argument("--growth", choices=_GROWTH_CHOICES, 
                           default="current_trend", help="Growth assumption")
-    
-    # Table hotspots
+
+def _add_table_hotspots(subparsers):
     th_parser = subparsers.add_parser("table-hotspots", help="🔥 Table access analysis")
     th_parser.add_argument("--days", type=int, default=7, help="Number of days to analyze")
     th_parser.add_argument("--min-cost", type=float, default=5.0, help="Minimum access cost")
-    
-    # Materialized views
+
+def _add_materialized_views(subparsers):
     mv_parser = subparsers.add_parser("materialized-views", help="🏗️ Materialized view recommendations")
     mv_parser.add_argument("--days", type=int, default=14, help="Number of days to analyze")
     mv_parser.add_argument("--min-repetitions", type=int, default=3, help="Minimum repetitions")
     mv_parser.add_argument("--min-cost", type=float, default=5.0, help="Minimum cost per execution")
-    
-    # Optimization report
+
+def _add_optimization_report(subparsers):
     or_parser = subparsers.add_parser("optimization-report", help="📋 Comprehensive optimization report")
     or_parser.add_argument("--days", type=int, default=7, help="Number of days to analyze")
-    or_parser.add_argument("--report-type", choices=["executive", "technical", "stakeholder"], 
-                          default="executive", help="Report type")
-    
+    or_parser.add_argument("--report-type", choices=_REPORT_CHOICES,
+                          help="Report type (default: executive; not used with --parallel)")
+    or_parser.add_argument("--parallel", action="store_true",
+                          help="Run the underlying analyses concurrently and combine their "
+                               "results as report sections")
+
+def _add_query(subparsers):
     # Deprecated command
     query_parser = subparsers.add_parser("query", help="❌ Single query analysis (deprecated)")
     query_parser.add_argument("sql", nargs='?', help="SQL query to analyze")
     query_parser.add_argument("--optimize", action="store_true", help="Include optimization suggestions")
+
+def _add_batch(subparsers):
+    batch_parser = subparsers.add_parser("batch", help="📦 Run newline-separated commands from stdin")
+    batch_parser.add_argument("--tools", help="Comma-separated tools to run instead of reading stdin")
+    batch_parser.add_argument("--days", type=int, help="Override --days for every tool in --tools")
+
+def _global_argv(args):
+    """Global options to pass on to commands run from a batch."""
+    argv = ["--project", args.project, "--cache-ttl", str(args.cache_ttl)]
+    if args.quiet:
+        argv.append("--quiet")
+    if args.no_cache:
+        argv.append("--no-cache")
+    return argv
+
+async def _run_tool_list(args):
+    """Run the tools named in --tools with their default options.
+
+    ToolSpec tools only call into the shared tool modules, so their calls run
+    concurrently in worker threads and the results are printed in the order
+    requested. Other tools print as they go and run one after another.
+    """
+    import asyncio
+
+    ok = True
+    tool_args = []
+    for tool in filter(None, (t.strip() for t in args.tools.split(","))):
+        parsed = None if tool == "batch" else _parse_command(tool, [*_global_argv(args), tool])
+        if parsed is None:
+            print(f"❌ {_unknown_tool_message(tool)}")
+            ok = False
+            continue
+        tool_ns, handler = parsed
+        if args.days is not None and hasattr(tool_ns, "days"):
+            tool_ns.days = args.days
+        tool_args.append((tool_ns, handler))
+
+    def tool_spec(handler):
+        return handler.args[0] if getattr(handler, "func", None) is run_tool else None
+
+    async def call_spec(spec, tool_ns):
+        return await asyncio.to_thread(
+            _call_tool, tool_ns, spec.module, spec.func, **spec.kwargs(tool_ns)
+        )
+
+    spec_args = [(tool_spec(handler), ns) for ns, handler in tool_args if tool_spec(handler)]
+    results = await asyncio.gather(
+        *(call_spec(spec, ns) for spec, ns in spec_args), return_exceptions=True
+    )
+    spec_results = {id(ns): result for (_, ns), result in zip(spec_args, results, strict=True)}
+
+    for tool_ns, handler in tool_args:
+        _write_banner(tool_ns, f"\n🚀 Running tool: {tool_ns.tool}")
+        spec = tool_spec(handler)
+        if spec is None:
+            ok = _dispatch(tool_ns, handler) and ok
+            continue
+        result = spec_results[id(tool_ns)]
+        if isinstance(result, Exception):
+            ok = _report_tool(spec, tool_ns, None, result) and ok
+        else:
+            ok = _report_tool(spec, tool_ns, result) and ok
+    return ok
+
+def run_batch(args):
+    """Run several commands in a single process.
+
+    With --tools, the listed tools run with their default options (see
+    _run_tool_list). Otherwise commands are read from stdin: each non-empty
+    line is parsed like a normal command line (without the script name).
+    Commands share the batch's --project, imported tool modules and settings,
+    so a line may not set its own --project. A JSON status line is printed
+    after each stdin command; its success reflects the handler's outcome.
+    """
+    if args.tools:
+        return _run_tool_list(args)
+
+    import shlex
+
+    ok = True
+    for line in sys.stdin:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        argv = [*_global_argv(args), *shlex.split(line)]
+        status = {"command": line, "success": False}
+        tool = _requested_tool(argv)
+        try:
+            parsed = None if tool in (None, "batch") else _parse_command(tool, argv)
+            if tool is None or tool == "batch":
+                status["error"] = "expected a tool name"
+            elif parsed is None:
+                status["error"] = _unknown_tool_message(tool)
+            elif parsed[0].project != args.project:
+                # bigquery_core and GOOGLE_CLOUD_PROJECT are already bound to the batch's project
+                status["error"] = "--project applies to the whole batch, not a single command"
+            elif _dispatch(*parsed):
+                status["success"] = True
+            else:
+                status["error"] = "command failed"
+        except SystemExit:
+            status["error"] = "invalid arguments"
+        except Exception as e:
+            status["error"] = str(e)
+
+        print(_dumps(status))
+        ok = ok and status["success"]
+        if args.long_running or os.environ.get("DATAOPS_DAEMON"):
+            _release_memory()
+    return ok
+
+_CORE_TOOLS = frozenset({"health", "costs", "top-users"})
+
+# Static command table: tool name -> (register_args, handler), in help order.
+# Core tools (bigquery_core.py) first, then advanced tools (bigquery_wrapper.py).
+_COMMANDS = {
+    "health": (_add_health, run_health_check),
+    "costs": (_add_costs, run_get_costs),
+    "top-users": (_add_top_users, run_top_users),
+    "service-accounts": (_add_service_accounts, partial(run_tool, SERVICE_ACCOUNTS)),
+    "expensive-queries": (_add_expensive_queries, partial(run_tool, EXPENSIVE_QUERIES)),
+    "optimization-patterns": (_add_optimization_patterns, partial(run_tool, OPTIMIZATION_PATTERNS)),
+    "cost-forecast": (_add_cost_forecast, partial(run_tool, COST_FORECAST)),
+    "table-hotspots": (_add_table_hotspots, partial(run_tool, TABLE_HOTSPOTS)),
+    "materialized-views": (_add_materialized_views, partial(run_tool, MATERIALIZED_VIEWS)),
+    "optimization-report": (_add_optimization_report, run_optimization_report),
+    "query": (_add_query, run_analyze_query),
+    "batch": (_add_batch, run_batch),
+}
+
+def _release_memory():
+    """Collect garbage and hand freed heap pages back to the OS.
+
+    Only worth it when the process outlives a single command, so callers gate
+    this behind --long-running / DATAOPS_DAEMON.
+    """
+    import gc
+    gc.collect()
+
+    if sys.platform == "linux":
+        try:
+            import ctypes
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass  # Non-glibc libc (e.g. musl) has no malloc_trim
+
+_GLOBAL_OPTIONS_WITH_VALUE = frozenset({"--project", "--cache-ttl"})
+
+def _requested_tool(argv):
+    """Return the subcommand named in argv, skipping global options and their values."""
+    skip_next = False
+    for arg in argv:
+        if skip_next:
+            skip_next = False
+        elif arg in _GLOBAL_OPTIONS_WITH_VALUE:
+            skip_next = True
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+_USAGE = """\
+usage: client.py [-h] [--version] [--project PROJECT] [--long-running] [--quiet]
+                 [--no-cache] [--cache-ttl SECONDS] [--profile-imports] <tool> ...
+
+BigQuery Analysis CLI - Enhanced with BigQuery Core
+
+Core tools (bigquery_core.py):
+  health                 🏥 Check BigQuery connectivity
+  costs                  📊 Daily cost analysis (ENHANCED)
+  top-users              👥 Top BigQuery users by cost (ENHANCED)
+
+Advanced tools (bigquery_wrapper.py):
+  service-accounts       🔍 Service account cost analysis
+  expensive-queries      💰 Expensive queries analysis
+  optimization-patterns  🔍 Query optimization patterns
+  cost-forecast          📈 Cost forecasting
+  table-hotspots         🔥 Table access analysis
+  materialized-views     🏗️ Materialized view recommendations
+  optimization-report    📋 Comprehensive optimization report
+  query                  ❌ Single query analysis (deprecated)
+
+Other:
+  batch                  📦 Run newline-separated commands from stdin (or --tools a,b,c)
+
+Options:
+  -h, --help             show this help message and exit
+  --version              show the CLI version and exit
+  --project PROJECT      GCP Project ID (default: gcp-wow-wiq-tsr-dev)
+  --long-running         Release memory after each command (also enabled by DATAOPS_DAEMON)
+  --quiet                Only print tool results, no banners
+  --no-cache             Bypass the on-disk result cache (~/.cache/dataops-mcp)
+  --cache-ttl SECONDS    Seconds to reuse cached results (default: 300)
+  --profile-imports      Print the slowest imports (python -X importtime) after the command
+
+Run 'python client.py <tool> --help' for tool options.
+
+� Quick start examples:
+  python client.py health                           # Test connectivity
+  python client.py costs --days 7                  # Core cost analysis
+  python client.py costs --days 30 --details       # Detailed insights
+  python client.py top-users --limit 20            # Enhanced user analysis
+  python client.py service-accounts --filter sa    # Service account deep dive
+  printf 'health\\ncosts --days 7\\n' | python client.py batch
+  python client.py batch --tools expensive-queries,table-hotspots --days 14
+  python client.py optimization-report --days 14 --parallel
+"""
+
+def _build_parser(register_args):
+    """Build the CLI parser with only one tool's subparser registered."""
+    parser = argparse.ArgumentParser(
+        prog="client.py",
+        description="BigQuery Analysis CLI - Enhanced with BigQuery Core",
+    )
+    parser.add_argument("--project", default=_DEFAULT_PROJECT, help="GCP Project ID")
+    parser.add_argument("--long-running", action="store_true",
+                        help="Release memory after each command (also enabled by DATAOPS_DAEMON)")
+    parser.add_argument("--quiet", action="store_true", help="Only print tool results, no banners")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk result cache")
+    parser.add_argument("--cache-ttl", type=int, default=_DEFAULT_CACHE_TTL,
+                        help="Seconds to reuse cached results (default: 300)")
+    parser.add_argument("--profile-imports", action="store_true",
+                        help="Print the slowest imports (python -X importtime) after the command")
     
-    args = parser.parse_args()
-    
-    if not args.tool:
-        parser.print_help()
-        print("\n� Quick start examples:")
-        print("  python client.py health                           # Test connectivity")
-        print("  python client.py costs --days 7                  # Core cost analysis")
-        print("  python client.py costs --days 30 --details       # Detailed insights")
-        print("  python client.py top-users --limit 20            # Enhanced user analysis")
-        print("  python client.py service-accounts --filter sa    # Service account deep dive")
-        print("\n📖 Architecture:")
-        print("  🎯 Core Tools: health, costs, top-users (bigquery_core.py)")
-        print("  🔧 Advanced Tools: service-accounts, expensive-queries, etc. (bigquery_wrapper.py)")
+    subparsers = parser.add_subparsers(dest="tool", help="Available analysis tools")
+    register_args(subparsers)
+
+    return parser
+
+def _parse_command(tool, argv):
+    """Parse argv for tool with a single table lookup.
+
+    Returns (args, handler), or None when tool is not a known command.
+    """
+    command = _COMMANDS.get(tool)
+    if command is None:
+        return None
+    register_args, handler = command
+    return _build_parser(register_args).parse_args(argv), handler
+
+def _unknown_tool_message(tool):
+    return f"client.py: error: unknown tool '{tool}' (choose from {', '.join(_COMMANDS)})"
+
+def _dispatch(args, handler):
+    """Run a tool handler with its parsed args and return whether it succeeded.
+
+    Handlers are plain functions; one that needs an event loop returns a
+    coroutine, and only then is asyncio imported and a loop started. Handlers
+    report their own errors and return False when they fail.
+    """
+    result = handler(args)
+    if isinstance(result, Coroutine):
+        import asyncio
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass  # Fall back to the default asyncio event loop
+        result = asyncio.run(result)
+    return result is not False
+
+_PROFILE_TOP_N = 20
+
+def _profile_imports(argv):
+    """Re-run the CLI under -X importtime and print the slowest imports.
+
+    The command's own stdout passes through unchanged; the import timings are
+    read from its stderr and the top entries by cumulative time are printed
+    afterwards. Returns the command's exit status.
+    """
+    import subprocess
+
+    # No shell is involved and the child is this same script run by the same
+    # interpreter; argv is the user's own command line, passed through as-is.
+    proc = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), *argv],
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+
+    timings = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            sys.stderr.write(line + "\n")
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if self_us.strip().isdigit():  # skip the column header line
+            timings.append((int(cumulative_us), int(self_us), name.strip()))
+    timings.sort(reverse=True)
+
+    sys.stdout.write(f"\n⏱️ Top {_PROFILE_TOP_N} imports by cumulative time:\n")
+    sys.stdout.write(f"{'cumulative [us]':>16} {'self [us]':>10}  module\n")
+    sys.stdout.write("".join(
+        f"{cumulative:>16} {self_time:>10}  {name}\n"
+        for cumulative, self_time, name in timings[:_PROFILE_TOP_N]
+    ))
+    return proc.returncode
+
+def main():
+    """Main CLI function with updated architecture."""
+    argv = sys.argv[1:]
+
+    if "--profile-imports" in argv:
+        sys.exit(_profile_imports([a for a in argv if a != "--profile-imports"]))
+
+    # Fast paths: answer --version/--help and reject unknown tools before
+    # any tool's subparser is constructed
+    tool = _requested_tool(argv)
+    if tool is None:
+        options = [a for a in argv if a != "--version"]
+        if options and not {"-h", "--help"} & set(options):
+            # Global options only; the parser rejects unknown ones and missing values
+            _build_parser(lambda subparsers: None).parse_args(options)
+        if "--version" in argv:
+            from version import __version__
+            sys.stdout.write(f"client.py {__version__}\n")
+        else:
+            sys.stdout.write(_USAGE)
         return
-    
-    print(f"🚀 Running tool: {args.tool}")
-    print(f"📊 Project: {args.project}")
-    
-    # Determine which architecture to use
-    core_tools = ["health", "costs", "top-users"]
-    if args.tool in core_tools:
-        print(f"🎯 Using: bigquery_core.py (Enhanced)")
-    else:
-        print(f"🔧 Using: bigquery_wrapper.py (Advanced)")
-    print()
+    parsed = _parse_command(tool, argv)
+    if parsed is None:
+        sys.stderr.write(_unknown_tool_message(tool) + "\n")
+        sys.exit(2)
+    args, handler = parsed
+
+    os.environ["GOOGLE_CLOUD_PROJECT"] = args.project
+
+    banner = [f"🚀 Running tool: {args.tool}", f"📊 Project: {args.project}"]
+    if args.tool in _CORE_TOOLS:
+        banner.append("🎯 Using: bigquery_core.py (Enhanced)")
+    elif args.tool != "batch":
+        banner.append("🔧 Using: bigquery_wrapper.py (Advanced)")
+    _write_banner(args, *banner, "")
     
     try:
-        # === CORE TOOLS (bigquery_core.py) ===
-        if args.tool == "health":
-            asyncio.run(run_health_check(args))
-        elif args.tool == "costs":
-            asyncio.run(run_get_costs(args))
-        elif args.tool == "top-users":
-            asyncio.run(run_top_users(args))
-        
-        # === ADVANCED TOOLS (bigquery_wrapper.py) ===  
-        elif args.tool == "service-accounts":
-            asyncio.run(run_service_account_analysis(args))
-        elif args.tool == "expensive-queries":
-            asyncio.run(run_expensive_queries_analysis(args))
-        elif args.tool == "optimization-patterns":
-            asyncio.run(run_optimization_patterns(args))
-        elif args.tool == "cost-forecast":
-            asyncio.run(run_cost_forecast(args))
-        elif args.tool == "table-hotspots":
-            asyncio.run(run_table_hotspots(args))
-        elif args.tool == "materialized-views":
-            asyncio.run(run_materialized_views(args))
-        elif args.tool == "optimization-report":
-            asyncio.run(run_optimization_report(args))
-        elif args.tool == "query":
-            asyncio.run(run_analyze_query(args))
-        else:
-            print(f"❌ Unknown tool: {args.tool}")
+        _dispatch(args, handler)
     
     except KeyboardInterrupt:
         print("\n⏹️  Cancelled by user")
     except Exception as e:
         print(f"❌ Execution failed: {e}")
-        print(f"💡 Suggestion: Check your Google Cloud authentication and project permissions")
+        print("💡 Suggestion: Check your Google Cloud authentication and project permissions")
+    finally:
+        sys.stdout.flush()
+        if args.long_running or os.environ.get("DATAOPS_DAEMON"):
+            _release_memory()
 
 if __name__ == "__main__":
     main()
@@ -11,14 +11,31 @@ Provides standardized logging configuration across all modules including:
 - Error reporting with context
 """
 
+import atexit
+import contextlib
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 import json
-from datetime import datetime
+from time import perf_counter_ns
 from pathlib import Path
 from typing import Dict, Any, Optional
 import structlog
-from functools import wraps
+from functools import cache, lru_cache, wraps
+
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, default=str)
 
 
 # Default logging configuration
@@ -28,41 +45,131 @@ DEFAULT_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 # Performance tracking logger
 PERFORMANCE_LOGGER_NAME = 'dataops.performance'
 
+# Accepted level names for setup_logging; anything else falls back to INFO
+_LEVEL_MAP = {
+    'NOTSET': logging.NOTSET,
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARN': logging.WARN,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'FATAL': logging.FATAL,
+    'CRITICAL': logging.CRITICAL,
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """Render each record as a single JSON object.
+
+    Fields are serialized rather than interpolated into a template, so
+    messages containing quotes or newlines still produce valid JSON.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': self.formatTime(record, self.datefmt),
+            'name': record.name,
+            'level': record.levelname,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return _dumps(entry)
+
+
+# Formatters are stateless, so every handler shares these instances
+_TEXT_FMT = logging.Formatter(DEFAULT_LOG_FORMAT, DEFAULT_DATE_FORMAT)
+_JSON_FMT = JsonFormatter(datefmt=DEFAULT_DATE_FORMAT)
+_PERF_FMT = logging.Formatter('PERF - %(asctime)s - %(message)s', DEFAULT_DATE_FORMAT)
+
 
 class PerformanceLogger:
     """Logger for tracking performance metrics and timing."""
+
+    __slots__ = ('logger',)
     
     def __init__(self, name: str = PERFORMANCE_LOGGER_NAME):
         self.logger = logging.getLogger(name)
     
     def log_timing(self, operation: str, duration_ms: float, context: Dict[str, Any] = None):
         """Log timing information for operations."""
-        context = context or {}
-        self.logger.info(
-            f"Performance: {operation}",
-            extra={
-                'operation': operation,
-                'duration_ms': duration_ms,
-                'timestamp': datetime.now().isoformat(),
-                **context
-            }
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        extra = {'duration_ms': duration_ms, **context} if context else {'duration_ms': duration_ms}
+        _perf_adapter(self.logger, 'operation', operation).info(
+            "Performance: %s", operation, extra=extra
         )
     
     def log_query_performance(self, query_type: str, duration_ms: float, 
                             rows_processed: int = 0, cost_usd: float = 0):
         """Log BigQuery performance metrics."""
-        self.logger.info(
-            f"Query Performance: {query_type}",
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        _perf_adapter(self.logger, 'query_type', query_type).info(
+            "Query Performance: %s",
+            query_type,
             extra={
-                'query_type': query_type,
                 'duration_ms': duration_ms,
                 'rows_processed': rows_processed,
                 'cost_usd': cost_usd,
-                'timestamp': datetime.now().isoformat()
             }
         )
 
 
+class _PerfAdapter(logging.LoggerAdapter):
+    """LoggerAdapter that merges per-call extra fields into its fixed ones.
+
+    The record's own `created` time stands in for a separate timestamp field.
+    """
+
+    def process(self, msg, kwargs):
+        extra = kwargs.get('extra')
+        kwargs['extra'] = {**self.extra, **extra} if extra else self.extra
+        return msg, kwargs
+
+
+@lru_cache(maxsize=256)
+def _perf_adapter(logger: logging.Logger, field: str, value: str) -> _PerfAdapter:
+    """Adapter carrying the invariant field for one operation or query type."""
+    return _PerfAdapter(logger, {field: value})
+
+
+# Shared by the decorators so wrapped calls never look up the perf logger
+_PERF_LOGGER = PerformanceLogger()
+
+
+_structlog_configured = False
+
+
+def _configure_structlog_once(log_level: int) -> None:
+    """Configure structlog for JSON output the first time it is needed.
+
+    The filtering bound logger turns calls below log_level into no-ops, so
+    the level in effect for the first JSON logger applies process-wide.
+    """
+    global _structlog_configured
+    if _structlog_configured:
+        return
+
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer()
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+    _structlog_configured = True
+
+
 class StructuredLogger:
     """Structured logger with JSON output for production environments."""
     
@@ -76,35 +183,27 @@ class StructuredLogger:
         logger = logging.getLogger(self.name)
         
         if self.enable_json:
-            # Configure structlog for JSON output
-            structlog.configure(
-                processors=[
-                    structlog.stdlib.filter_by_level,
-                    structlog.stdlib.add_logger_name,
-                    structlog.stdlib.add_log_level,
-                    structlog.stdlib.PositionalArgumentsFormatter(),
-                    structlog.processors.StackInfoRenderer(),
-                    structlog.processors.format_exc_info,
-                    structlog.processors.UnicodeDecoder(),
-                    structlog.processors.JSONRenderer()
-                ],
-                context_class=dict,
-                logger_factory=structlog.stdlib.LoggerFactory(),
-                cache_logger_on_first_use=True,
-            )
+            _configure_structlog_once(logger.getEffectiveLevel())
+            self._log = structlog.get_logger(self.name)
         
         return logger
     
     def info(self, message: str, **context):
         """Log info message with context."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if self.enable_json:
-            log = structlog.get_logger(self.name)
-            log.info(message, **context)
+            self._log.info(message, **context)
         else:
-            self.logger.info(f"{message} - Context: {context}" if context else message)
+            if context:
+                self.logger.info("%s - Context: %s", message, context)
+            else:
+                self.logger.info(message)
     
     def error(self, message: str, error: Exception = None, **context):
         """Log error message with context and exception details."""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         error_context = {
             'error_type': type(error).__name__ if error else 'Unknown',
             'error_message': str(error) if error else 'No error details',
@@ -112,20 +211,98 @@ class StructuredLogger:
         }
         
         if self.enable_json:
-            log = structlog.get_logger(self.name)
-            log.error(message, **error_context)
+            self._log.error(message, **error_context)
         else:
-            self.logger.error(f"{message} - Context: {error_context}")
+            self.logger.error("%s - Context: %s", message, error_context)
     
     def debug(self, message: str, **context):
         """Log debug message with context."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         if self.enable_json:
-            log = structlog.get_logger(self.name)
-            log.debug(message, **context)
+            self._log.debug(message, **context)
         else:
-            self.logger.debug(f"{message} - Context: {context}" if context else message)
+            if context:
+                self.logger.debug("%s - Context: %s", message, context)
+            else:
+                self.logger.debug(message)
+
 
+class BufferedPerfHandler(logging.StreamHandler):
+    """Stream handler that writes performance records in batches.
 
+    Formatted records are buffered and written with a single write() once
+    `capacity` records are pending or every `flush_interval` seconds, whichever
+    comes first. close() writes anything still buffered.
+    """
+
+    def __init__(self, stream=None, capacity: int = 256, flush_interval: float = 0.5):
+        super().__init__(stream)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._stop_flushing = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, name="perf-log-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._buffer) >= self.capacity:
+            self.flush()
+
+    def flush(self) -> None:
+        # The handler lock is reentrant, so emit() (which runs under it) may call this
+        self.acquire()
+        try:
+            if self._buffer and self.stream:
+                self.stream.write("".join(self._buffer))
+                self._buffer.clear()
+                self.stream.flush()
+        finally:
+            self.release()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flushing.wait(self.flush_interval):
+            try:
+                self.flush()
+            except (OSError, ValueError):
+                return  # Stream closed or broken; close() makes the final attempt
+
+    def close(self) -> None:
+        self._stop_flushing.set()
+        self.flush()
+        super().close()
+
+
+# Writes queued performance records to stdout from a background thread
+_perf_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _start_perf_listener(perf_logger: logging.Logger) -> None:
+    """Route performance records through a queue so callers never block on I/O."""
+    global _perf_listener
+    if _perf_listener is not None or perf_logger.handlers:
+        return  # Already configured; don't stack handlers
+
+    perf_queue = queue.SimpleQueue()
+    perf_handler = BufferedPerfHandler(sys.stdout)
+    perf_handler.setFormatter(_PERF_FMT)
+    perf_logger.addHandler(logging.handlers.QueueHandler(perf_queue))
+
+    _perf_listener = logging.handlers.QueueListener(perf_queue, perf_handler)
+    _perf_listener.start()
+    # atexit runs these in reverse: drain the queue first, then flush the buffer
+    atexit.register(perf_handler.close)
+    atexit.register(_perf_listener.stop)
+
+
+@cache
 def setup_logging(
     level: str = "INFO",
     enable_debug: bool = False,
@@ -145,9 +322,11 @@ def setup_logging(
     
     Returns:
         Configured logger instance
+
+    Calls with the same arguments return the already configured logger.
     """
     # Convert string level to logging level
-    log_level = getattr(logging, level.upper(), logging.INFO)
+    log_level = _LEVEL_MAP.get(level.upper(), logging.INFO)
     
     # Override level if debug is enabled
     if enable_debug:
@@ -165,11 +344,7 @@ def setup_logging(
     console_handler.setLevel(log_level)
     
     # Choose formatter based on JSON preference
-    if enable_json:
-        # Simple JSON formatter for console
-        formatter = logging.Formatter('{"timestamp": "%(asctime)s", "name": "%(name)s", "level": "%(levelname)s", "message": "%(message)s"}')
-    else:
-        formatter = logging.Formatter(DEFAULT_LOG_FORMAT, DEFAULT_DATE_FORMAT)
+    formatter = _JSON_FMT if enable_json else _TEXT_FMT
     
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
@@ -184,12 +359,13 @@ def setup_logging(
     # Performance logger setup
     perf_logger = logging.getLogger(PERFORMANCE_LOGGER_NAME)
     perf_logger.setLevel(logging.INFO)
-    perf_handler = logging.StreamHandler(sys.stdout)
-    perf_formatter = logging.Formatter('PERF - %(asctime)s - %(message)s', DEFAULT_DATE_FORMAT)
-    perf_handler.setFormatter(perf_formatter)
-    perf_logger.addHandler(perf_handler)
+    # Perf records have their own handler; don't also write them via ancestors
+    perf_logger.propagate = False
+    _start_perf_listener(perf_logger)
     
-    logger.info(f"Logging configured - Level: {level}, Debug: {enable_debug}, JSON: {enable_json}")
+    logger.info(
+        "Logging configured - Level: %s, Debug: %s, JSON: %s", level, enable_debug, enable_json
+    )
     
     return logger
 
@@ -219,28 +395,42 @@ def log_function_call(logger: logging.Logger = None):
         logger: Optional logger instance, will create one if not provided
     """
     def decorator(func):
+        func_logger = logger or logging.getLogger(func.__module__)
+        operation = f"{func.__module__}.{func.__name__}"
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            func_logger = logger or logging.getLogger(func.__module__)
-            start_time = datetime.now()
-            
+            debug_enabled = func_logger.isEnabledFor(logging.DEBUG)
+
             # Log function entry
-            func_logger.debug(f"Entering {func.__name__} with args: {args}, kwargs: {kwargs}")
+            if debug_enabled:
+                func_logger.debug(
+                    "Entering %s with args: %r, kwargs: %r", func.__name__, args, kwargs
+                )
+
+            # Timing is only reported at DEBUG or to the performance logger
+            if not (debug_enabled or _PERF_LOGGER.logger.isEnabledFor(logging.INFO)):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    func_logger.error("Error in %s: %s", func.__name__, e)
+                    raise
+
+            start_ns = perf_counter_ns()
             
             try:
                 result = func(*args, **kwargs)
                 
                 # Calculate execution time
-                end_time = datetime.now()
-                duration_ms = (end_time - start_time).total_seconds() * 1000
+                duration_ms = (perf_counter_ns() - start_ns) / 1_000_000
                 
                 # Log successful completion
-                func_logger.debug(f"Completed {func.__name__} in {duration_ms:.2f}ms")
+                if debug_enabled:
+                    func_logger.debug("Completed %s in %.2fms", func.__name__, duration_ms)
                 
                 # Log to performance logger
-                perf_logger = PerformanceLogger()
-                perf_logger.log_timing(
-                    operation=f"{func.__module__}.{func.__name__}",
+                _PERF_LOGGER.log_timing(
+                    operation=operation,
                     duration_ms=duration_ms,
                     context={'success': True}
                 )
@@ -249,16 +439,14 @@ def log_function_call(logger: logging.Logger = None):
                 
             except Exception as e:
                 # Calculate execution time for failed calls
-                end_time = datetime.now()
-                duration_ms = (end_time - start_time).total_seconds() * 1000
+                duration_ms = (perf_counter_ns() - start_ns) / 1_000_000
                 
                 # Log error
-                func_logger.error(f"Error in {func.__name__}: {e}")
+                func_logger.error("Error in %s: %s", func.__name__, e)
                 
                 # Log to performance logger
-                perf_logger = PerformanceLogger()
-                perf_logger.log_timing(
-                    operation=f"{func.__module__}.{func.__name__}",
+                _PERF_LOGGER.log_timing(
+                    operation=operation,
                     duration_ms=duration_ms,
                     context={'success': False, 'error': str(e)}
                 )
@@ -277,55 +465,61 @@ def log_bigquery_operation(operation_type: str):
         operation_type: Type of BigQuery operation (query, health_check, etc.)
     """
     def decorator(func):
+        logger = logging.getLogger(func.__module__)
+        operation = f"bigquery.{operation_type}"
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            logger = logging.getLogger(func.__module__)
-            perf_logger = PerformanceLogger()
-            start_time = datetime.now()
+            start_ns = perf_counter_ns()
             
-            logger.info(f"Starting BigQuery operation: {operation_type}")
+            info_enabled = logger.isEnabledFor(logging.INFO)
+            if info_enabled:
+                logger.info("Starting BigQuery operation: %s", operation_type)
             
             try:
                 result = func(*args, **kwargs)
                 
                 # Calculate timing
-                end_time = datetime.now()
-                duration_ms = (end_time - start_time).total_seconds() * 1000
+                duration_ms = (perf_counter_ns() - start_ns) / 1_000_000
                 
-                # Extract metrics from result if it's JSON
-                cost_usd = 0
-                rows_processed = 0
-                try:
-                    if isinstance(result, str):
-                        result_data = json.loads(result)
-                        if result_data.get('success'):
-                            data = result_data.get('data', {})
-                            cost_usd = data.get('total_cost_usd', 0)
-                            rows_processed = data.get('total_queries', 0)
-                except:
-                    pass  # Don't fail if we can't extract metrics
+                # Metrics are only extracted when the performance logger will record them
+                if _PERF_LOGGER.logger.isEnabledFor(logging.INFO):
+                    # Extract metrics from result if it's JSON
+                    cost_usd = 0
+                    rows_processed = 0
+                    # Don't fail if we can't extract metrics (JSON decode errors are ValueErrors)
+                    if isinstance(result, str) and result.startswith('{'):
+                        with contextlib.suppress(ValueError, AttributeError, TypeError):
+                            result_data = _loads(result)
+                            if result_data.get('success'):
+                                data = result_data.get('data', {})
+                                cost_usd = data.get('total_cost_usd', 0)
+                                rows_processed = data.get('total_queries', 0)
                 
-                # Log performance
-                perf_logger.log_query_performance(
-                    query_type=operation_type,
-                    duration_ms=duration_ms,
-                    rows_processed=rows_processed,
-                    cost_usd=cost_usd
-                )
+                    # Log performance
+                    _PERF_LOGGER.log_query_performance(
+                        query_type=operation_type,
+                        duration_ms=duration_ms,
+                        rows_processed=rows_processed,
+                        cost_usd=cost_usd
+                    )
                 
-                logger.info(f"Completed BigQuery operation: {operation_type} in {duration_ms:.2f}ms")
+                if info_enabled:
+                    logger.info(
+                        "Completed BigQuery operation: %s in %.2fms", operation_type, duration_ms
+                    )
                 return result
                 
             except Exception as e:
-                end_time = datetime.now()
-                duration_ms = (end_time - start_time).total_seconds() * 1000
+                duration_ms = (perf_counter_ns() - start_ns) / 1_000_000
                 
-                logger.error(f"BigQuery operation failed: {operation_type} - {e}")
-                perf_logger.log_timing(
-                    operation=f"bigquery.{operation_type}",
-                    duration_ms=duration_ms,
-                    context={'success': False, 'error': str(e)}
-                )
+                logger.error("BigQuery operation failed: %s - %s", operation_type, e)
+                if _PERF_LOGGER.logger.isEnabledFor(logging.INFO):
+                    _PERF_LOGGER.log_timing(
+                        operation=operation,
+                        duration_ms=duration_ms,
+                        context={'success': False, 'error': str(e)}
+                    )
                 raise
         
         return wrapper
@@ -368,6 +562,8 @@ __all__ = [
     'log_bigquery_operation',
     'PerformanceLogger',
     'StructuredLogger',
+    'JsonFormatter',
+    'BufferedPerfHandler',
     'get_server_logger',
     'get_bigquery_logger',
     'get_client_logger'
@@ -2,14 +2,18 @@
 
 import sys
 import os
+import re
 import argparse
-from typing import List, Callable, Any, Type, Optional, Dict
-from functools import wraps
+from dataclasses import dataclass
+from typing import Callable, Any, Type, Optional, Dict, Tuple
+from functools import lru_cache, partial, wraps
 import asyncio
 import logging
-from datetime import datetime
+from datetime import UTC, datetime
+from time import perf_counter_ns, time
 
 from mcp.server.fastmcp import FastMCP
+from logger import PerformanceLogger
 from resources.gcp_cost_resource import GCPCostResource
 from tools.cost_analysis_tools import CostAnalysisTools
 from tools.query_optimization_tools import QueryOptimizationTools
@@ -19,6 +23,28 @@ from tools.slack_integration_tools import SlackIntegrationTools
 from tools.agent_management_tools import AgentManagementTools
 from tools.dbt_integration_tools import DBTIntegrationTools
 from tools.sla_monitoring_tools import SLAMonitoringTools
+from tool_decorators import (
+    normalize_sql,
+    with_alert_batching,
+    with_antipattern_gate,
+    with_result_cache as _with_result_cache,
+)
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj)
+
+try:
+    import uvloop
+except ImportError:  # Not installed, or on Windows where it is unavailable
+    uvloop = None
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +52,7 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+perf_logger = PerformanceLogger()
 
 # Parse command line arguments
 parser = argparse.ArgumentParser(description="GCP Cost Optimization MCP Server")
@@ -50,8 +77,41 @@ parser.add_argument(
 )
 args, unknown = parser.parse_known_args()
 
+_env_bool = frozenset({'true', '1', 'yes'}).__contains__
+
+
+@dataclass(frozen=True, slots=True)
+class ServerConfig:
+    """Server configuration resolved once from CLI arguments and environment."""
+
+    project_id: Optional[str]
+    region: str
+    allow_write: bool
+    allow_sensitive: bool
+    enable_agents: bool
+    debug: bool
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "ServerConfig":
+        """Build the configuration; CLI flags take precedence over environment variables."""
+        env = os.environ
+        return cls(
+            project_id=args.project or env.get('GCP_PROJECT_ID'),
+            region=args.region or env.get('GCP_REGION', 'us-central1'),
+            allow_write=args.allow_write
+            or _env_bool(env.get('ALLOW_WRITE_OPERATIONS', '').casefold()),
+            allow_sensitive=args.allow_sensitive_data_access
+            or _env_bool(env.get('ALLOW_SENSITIVE_DATA_ACCESS', '').casefold()),
+            enable_agents=args.enable_multi_agent
+            or _env_bool(env.get('ENABLE_MULTI_AGENT', '').casefold()),
+            debug=args.debug,
+        )
+
+
+config = ServerConfig.from_args(args)
+
 # Set debug logging if requested
-if args.debug:
+if config.debug:
     logging.getLogger().setLevel(logging.DEBUG)
     logger.debug("Debug logging enabled")
 
@@ -62,54 +122,68 @@ sys.path.append(current_dir)
 # Create the MCP server for GCP cost optimization
 mcp = FastMCP("GCP Cost Optimization")
 
-# Initialize configuration from args and environment
-project_id = args.project or os.getenv('GCP_PROJECT_ID')
-region = args.region or os.getenv('GCP_REGION', 'us-central1')
-allow_write = args.allow_write or os.getenv('ALLOW_WRITE_OPERATIONS', 'false').lower() == 'true'
-allow_sensitive = args.allow_sensitive_data_access or os.getenv('ALLOW_SENSITIVE_DATA_ACCESS', 'false').lower() == 'true'
-enable_agents = args.enable_multi_agent or os.getenv('ENABLE_MULTI_AGENT', 'false').lower() == 'true'
-
-if not project_id:
+if not config.project_id:
     logger.error("GCP project ID is required. Use --project or set GCP_PROJECT_ID environment variable")
     sys.exit(1)
 
-logger.info(f"Starting GCP Cost Optimization MCP Server for project: {project_id}")
-logger.info(f"Configuration: region={region}, write_enabled={allow_write}, sensitive_data={allow_sensitive}, agents={enable_agents}")
+logger.info("Starting GCP Cost Optimization MCP Server for project: %s", config.project_id)
+logger.info(
+    "Configuration: region=%s, write_enabled=%s, sensitive_data=%s, agents=%s",
+    config.region, config.allow_write, config.allow_sensitive, config.enable_agents,
+)
 
 # Initialize our resource and tools classes with the specified GCP project and region
 try:
-    cost_resource = GCPCostResource(project_id=project_id, region=region)
-    cost_analysis_tools = CostAnalysisTools(project_id=project_id, region=region)
-    query_optimization_tools = QueryOptimizationTools(project_id=project_id, region=region)
-    anomaly_detection_tools = AnomalyDetectionTools(project_id=project_id, region=region)
+    cost_resource = GCPCostResource(project_id=config.project_id, region=config.region)
+    cost_analysis_tools = CostAnalysisTools(project_id=config.project_id, region=config.region)
+    query_optimization_tools = QueryOptimizationTools(project_id=config.project_id, region=config.region)
+    anomaly_detection_tools = AnomalyDetectionTools(project_id=config.project_id, region=config.region)
     
     # Optional integrations (only if write operations enabled)
-    github_tools = GitHubIntegrationTools(project_id=project_id) if allow_write else None
-    slack_tools = SlackIntegrationTools(project_id=project_id) if allow_write else None
+    github_tools = GitHubIntegrationTools(project_id=config.project_id) if config.allow_write else None
+    slack_tools = SlackIntegrationTools(project_id=config.project_id) if config.allow_write else None
     
     # Multi-agent tools (only if agents enabled)
-    agent_tools = AgentManagementTools(project_id=project_id, region=region) if enable_agents else None
+    agent_tools = AgentManagementTools(project_id=config.project_id, region=config.region) if config.enable_agents else None
     
     # Additional tools
-    dbt_tools = DBTIntegrationTools(project_id=project_id, region=region)
-    sla_tools = SLAMonitoringTools(project_id=project_id, region=region)
+    dbt_tools = DBTIntegrationTools(project_id=config.project_id, region=config.region)
+    sla_tools = SLAMonitoringTools(project_id=config.project_id, region=config.region)
     
     logger.info("All tool classes initialized successfully")
     
 except Exception as e:
-    logger.error(f"Failed to initialize tool classes: {e}")
+    logger.error("Failed to initialize tool classes: %s", e)
     sys.exit(1)
 
-# Capture the parsed CLI configuration in separate variables
-default_project = project_id
-default_region = region
+# Tool classes configured by project only (region is ignored)
+_PROJECT_ONLY_TOOLS = (GitHubIntegrationTools, SlackIntegrationTools)
+
+# Instances built above for the default project and region, reused by
+# with_gcp_config instead of constructing a new client per call
+_DEFAULT_INSTANCES: Dict[Type, Any] = {
+    tool_class: instance
+    for tool_class, instance in (
+        (CostAnalysisTools, cost_analysis_tools),
+        (QueryOptimizationTools, query_optimization_tools),
+        (AnomalyDetectionTools, anomaly_detection_tools),
+        (GitHubIntegrationTools, github_tools),
+        (SlackIntegrationTools, slack_tools),
+        (AgentManagementTools, agent_tools),
+        (DBTIntegrationTools, dbt_tools),
+        (SLAMonitoringTools, sla_tools),
+    )
+    if instance is not None
+}
 
 
 # Helper decorator to handle GCP configuration parameters for tools
 def with_gcp_config(tool_class: Type, method_name: Optional[str] = None) -> Callable:
     """
     Decorator that handles the project and region parameters for tool functions.
-    Creates a new instance of the specified tool class with the correct project and region.
+    Reuses the module-level tool instance for the default project and region, and
+    otherwise creates a new instance of the tool class with the requested ones.
+    Call durations are sent to the performance logger without delaying the reply.
 
     Args:
         tool_class: The class to instantiate with the project and region
@@ -117,46 +191,80 @@ def with_gcp_config(tool_class: Type, method_name: Optional[str] = None) -> Call
     """
 
     def decorator(func: Callable) -> Callable:
+        target_method = method_name or func.__name__
+        operation = f"{tool_class.__name__}.{target_method}"
+        project_only = tool_class in _PROJECT_ONLY_TOOLS
+        # Bound once here so calls for the default project and region skip the lookups
+        default_method = getattr(_DEFAULT_INSTANCES.get(tool_class), target_method, None)
+
+        def record_timing(start_ns: int, success: bool) -> None:
+            # Fire-and-forget: the record is emitted after the reply is handed back
+            asyncio.get_running_loop().call_soon(
+                perf_logger.log_timing,
+                operation,
+                (perf_counter_ns() - start_ns) / 1_000_000,
+                {'success': success},
+            )
+
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
+            start_ns = perf_counter_ns() if perf_logger.logger.isEnabledFor(logging.INFO) else None
+            success = False
             try:
-                project = kwargs.pop("project_id", None) or default_project
-                region = kwargs.pop("region", None) or default_region
+                project = kwargs.pop("project_id", None) or config.project_id
+                region = kwargs.pop("region", None) or config.region
                 
-                # Create tool instance with proper configuration
-                if tool_class in [GitHubIntegrationTools, SlackIntegrationTools]:
-                    tool_instance = tool_class(project_id=project)
-                elif tool_class == AgentManagementTools:
-                    tool_instance = tool_class(project_id=project, region=region) if enable_agents else None
-                    if tool_instance is None:
-                        raise RuntimeError("Multi-agent functionality is not enabled. Use --enable-multi-agent")
+                # Reuse the module-level instance's method for the default configuration
+                if default_method is not None and project == config.project_id and (
+                    region == config.region or project_only
+                ):
+                    method = default_method
                 else:
-                    tool_instance = tool_class(project_id=project, region=region)
-                
-                target_method = method_name or func.__name__
-                method = getattr(tool_instance, target_method)
+                    # Otherwise create tool instance with proper configuration
+                    if project_only:
+                        tool_instance = tool_class(project_id=project)
+                    elif tool_class == AgentManagementTools:
+                        tool_instance = tool_class(project_id=project, region=region) if config.enable_agents else None
+                        if tool_instance is None:
+                            raise RuntimeError("Multi-agent functionality is not enabled. Use --enable-multi-agent")
+                    else:
+                        tool_instance = tool_class(project_id=project, region=region)
+                    method = getattr(tool_instance, target_method)
+
                 result = method(**kwargs)
                 
                 if asyncio.iscoroutine(result):
-                    return await result
+                    result = await result
+                success = True
                 return result
                 
             except AttributeError as e:
-                logger.error(f"Method {target_method} not found in {tool_class.__name__}: {e}")
+                logger.error("Method %s not found in %s: %s", target_method, tool_class.__name__, e)
                 raise RuntimeError(
                     f"Method {target_method} not found in {tool_class.__name__}"
                 ) from e
             except Exception as e:
-                logger.error(f"Error executing {target_method} in {tool_class.__name__}: {e}")
+                logger.error("Error executing %s in %s: %s", target_method, tool_class.__name__, e)
                 raise RuntimeError(
                     f"An error occurred while executing {target_method} in {tool_class.__name__}: {str(e)}"
                 ) from e
+            finally:
+                # Every outcome is timed, including a missing method
+                if start_ns is not None:
+                    record_timing(start_ns, success)
 
         return wrapper
 
     return decorator
 
 
+# Result cache keyed with this server's default project and region
+with_result_cache = partial(
+    _with_result_cache,
+    key_defaults={"project_id": config.project_id, "region": config.region},
+)
+
+
 # ==============================
 # Resource Handlers
 # ==============================
@@ -245,7 +353,7 @@ def get_cost_forecast_resource(days: str) -> str:
 @mcp.resource("gcp://agents/insights/{agent_type}")
 def get_agent_insights_resource(agent_type: str) -> str:
     """Get latest insights from a specific agent type"""
-    if not enable_agents:
+    if not config.enable_agents:
         return '{"error": "Multi-agent functionality is not enabled"}'
     return cost_resource.get_agent_insights(agent_type)
 
@@ -253,7 +361,7 @@ def get_agent_insights_resource(agent_type: str) -> str:
 @mcp.resource("gcp://agents/status/all")
 def get_all_agents_status() -> str:
     """Get status and health of all deployed agents"""
-    if not enable_agents:
+    if not config.enable_agents:
         return '{"error": "Multi-agent functionality is not enabled"}'
     return cost_resource.get_all_agents_status()
 
@@ -262,22 +370,9 @@ def get_all_agents_status() -> str:
 # Prompts
 # ==============================
 
-
-@mcp.prompt()
-def analyze_bigquery_costs(
-    days: int = 7, project_id: str = None, include_predictions: bool = True
-) -> str:
-    """
-    Prompt for analyzing BigQuery costs and identifying optimization opportunities.
-
-    Args:
-        days: Number of days to analyze (default: 7)
-        project_id: Optional GCP project ID (uses default if not specified)
-        include_predictions: Include ML-based cost forecasting (default: true)
-    """
-    project_text = f" for project '{project_id}'" if project_id else f" for project '{default_project}'"
-    
-    return f"""I'll help you analyze BigQuery costs{project_text} over the last {days} days.
+# Prompt bodies are static apart from a few placeholders; rendered prompts are
+# cached by argument tuple since clients re-request the same prompts.
+_ANALYZE_COSTS_TMPL = """I'll help you analyze BigQuery costs{project_text} over the last {days} days.
 
 Let me start by gathering comprehensive cost data and identifying optimization opportunities.
 
@@ -302,26 +397,16 @@ Would you like me to focus on any specific area, such as:
 - Long-term budget planning and forecasting
 """
 
+# Above this many JOINs, exhaustive join-order search grows combinatorially, so
+# the optimize_query prompt asks for greedy ordering instead
+_GREEDY_JOIN_THRESHOLD = 8
+_JOIN_RE = re.compile(r"\bJOIN\b", re.IGNORECASE)
 
-@mcp.prompt()
-def optimize_expensive_query(
-    sql: str, target_savings_pct: int = 30, project_id: str = None
-) -> str:
-    """
-    Prompt for optimizing a specific expensive SQL query with AI-powered suggestions.
-
-    Args:
-        sql: The SQL query to optimize
-        target_savings_pct: Target cost reduction percentage (default: 30)
-        project_id: Optional GCP project ID (uses default if not specified)
-    """
-    project_text = f" in project '{project_id}'" if project_id else f" in project '{default_project}'"
-    
-    return f"""I'll analyze and optimize this BigQuery query{project_text} with a target of {target_savings_pct}% cost reduction.
+_OPTIMIZE_QUERY_TMPL = """I'll analyze and optimize this BigQuery query{project_text} with a target of {target_savings_pct}% cost reduction.
 
 **Query to optimize:**
 ```sql
-{sql[:500]}{'...' if len(sql) > 500 else ''}
+{sql_excerpt}
 ```
 
 My optimization process will include:
@@ -333,7 +418,7 @@ My optimization process will include:
 
 2. **AI-Powered Optimization**
    - Apply partition filtering strategies
-   - Optimize JOIN operations and order
+   - {join_strategy}
    - Improve column selection and aggregations
    - Suggest materialized view opportunities
 
@@ -353,22 +438,7 @@ Would you like me to proceed with the optimization analysis? I can also:
 - Suggest broader optimization opportunities for similar queries
 """
 
-
-@mcp.prompt()
-def investigate_cost_spike(
-    spike_date: str = None, project_id: str = None
-) -> str:
-    """
-    Prompt for investigating and resolving cost spikes with comprehensive root cause analysis.
-
-    Args:
-        spike_date: Optional date of the cost spike (YYYY-MM-DD format)
-        project_id: Optional GCP project ID (uses default if not specified)
-    """
-    project_text = f" in project '{project_id}'" if project_id else f" in project '{default_project}'"
-    date_text = f" on {spike_date}" if spike_date else " recently"
-    
-    return f"""I'll help you investigate the cost spike{date_text}{project_text} and provide actionable solutions.
+_INVESTIGATE_SPIKE_TMPL = """I'll help you investigate the cost spike{date_text}{project_text} and provide actionable solutions.
 
 My investigation will include:
 
@@ -401,10 +471,94 @@ Let me start by analyzing the cost data and identifying the primary contributors
 """
 
 
+@lru_cache(maxsize=64)
+def _render_analyze_costs(days: int, project_id: Optional[str]) -> str:
+    project_text = f" for project '{project_id or config.project_id}'"
+    return _ANALYZE_COSTS_TMPL.format(project_text=project_text, days=days)
+
+
+@lru_cache(maxsize=64)
+def _render_optimize_query(sql: str, target_savings_pct: int, project_id: Optional[str]) -> str:
+    project_text = f" in project '{project_id or config.project_id}'"
+    sql_excerpt = sql[:500] + ('...' if len(sql) > 500 else '')
+    join_count = len(_JOIN_RE.findall(normalize_sql(sql)))
+    if join_count > _GREEDY_JOIN_THRESHOLD:
+        join_strategy = (
+            f"Order the {join_count} JOINs greedily, most selective first, "
+            "instead of comparing every possible join order"
+        )
+    else:
+        join_strategy = "Optimize JOIN operations and order"
+    return _OPTIMIZE_QUERY_TMPL.format(
+        project_text=project_text,
+        target_savings_pct=target_savings_pct,
+        sql_excerpt=sql_excerpt,
+        join_strategy=join_strategy,
+    )
+
+
+@lru_cache(maxsize=64)
+def _render_investigate_spike(spike_date: Optional[str], project_id: Optional[str]) -> str:
+    project_text = f" in project '{project_id or config.project_id}'"
+    date_text = f" on {spike_date}" if spike_date else " recently"
+    return _INVESTIGATE_SPIKE_TMPL.format(date_text=date_text, project_text=project_text)
+
+
+@mcp.prompt()
+def analyze_bigquery_costs(
+    days: int = 7, project_id: str = None, include_predictions: bool = True
+) -> str:
+    """
+    Prompt for analyzing BigQuery costs and identifying optimization opportunities.
+
+    Args:
+        days: Number of days to analyze (default: 7)
+        project_id: Optional GCP project ID (uses default if not specified)
+        include_predictions: Include ML-based cost forecasting (default: true)
+    """
+    return _render_analyze_costs(days, project_id)
+
+
+@mcp.prompt()
+def optimize_expensive_query(
+    sql: str, target_savings_pct: int = 30, project_id: str = None
+) -> str:
+    """
+    Prompt for optimizing a specific expensive SQL query with AI-powered suggestions.
+
+    Args:
+        sql: The SQL query to optimize
+        target_savings_pct: Target cost reduction percentage (default: 30)
+        project_id: Optional GCP project ID (uses default if not specified)
+    """
+    return _render_optimize_query(sql, target_savings_pct, project_id)
+
+
+@mcp.prompt()
+def investigate_cost_spike(
+    spike_date: str = None, project_id: str = None
+) -> str:
+    """
+    Prompt for investigating and resolving cost spikes with comprehensive root cause analysis.
+
+    Args:
+        spike_date: Optional date of the cost spike (YYYY-MM-DD format)
+        project_id: Optional GCP project ID (uses default if not specified)
+    """
+    return _render_investigate_spike(spike_date, project_id)
+
+
 # ==============================
 # Tool Handlers
 # ==============================
 
+# Immutable list-argument defaults, shown as-is in the tool schemas
+_DEFAULT_GROUP_BY = ("date",)
+_DEFAULT_OPTIMIZATION_GOALS = ("cost", "performance")
+_DEFAULT_BREAKDOWN_BY = ("service",)
+_DEFAULT_MENTION_USERS = ()
+_DEFAULT_NOTIFICATION_CHANNELS = ("slack",)
+
 
 @mcp.tool()
 @with_gcp_config(CostAnalysisTools)
@@ -412,7 +566,7 @@ async def get_bigquery_costs(
     days: int = 7,
     project_id: str = None,
     include_predictions: bool = True,
-    group_by: List[str] = None,
+    group_by: Tuple[str, ...] = _DEFAULT_GROUP_BY,
     include_query_details: bool = False,
     region: str = None,
 ) -> str:
@@ -435,6 +589,7 @@ async def get_bigquery_costs(
 
 
 @mcp.tool()
+@with_result_cache("sql", side_effect_args=("create_pr_if_savings",))
 @with_gcp_config(CostAnalysisTools)
 async def analyze_query_cost(
     sql: str,
@@ -443,6 +598,7 @@ async def analyze_query_cost(
     optimization_model: str = "claude",
     create_pr_if_savings: bool = False,
     region: str = None,
+    cache_bypass: bool = False,
 ) -> str:
     """
     Analyze the cost impact of a SQL query before execution using BigQuery's dry-run API.
@@ -454,6 +610,7 @@ async def analyze_query_cost(
         optimization_model: AI model to use for optimization ("claude", "gpt-4", default: "claude")
         create_pr_if_savings: Automatically create GitHub PR if savings > threshold (default: false)
         region: GCP region for analysis
+        cache_bypass: Skip the 5-minute result cache and run a fresh dry-run (default: false)
 
     Returns:
         JSON string with detailed query cost analysis
@@ -491,10 +648,11 @@ async def detect_cost_anomalies(
 
 
 @mcp.tool()
+@with_antipattern_gate("sql")
 @with_gcp_config(QueryOptimizationTools)
 async def optimize_query(
     sql: str,
-    optimization_goals: List[str] = None,
+    optimization_goals: Tuple[str, ...] = _DEFAULT_OPTIMIZATION_GOALS,
     preserve_results: bool = True,
     include_explanation: bool = True,
     target_savings_pct: int = 30,
@@ -505,6 +663,10 @@ async def optimize_query(
     """
     Provide AI-powered SQL query optimization using Large Language Models.
 
+    Queries without a known cost anti-pattern (SELECT *, no partition filter,
+    cross joins, subqueries in WHERE, ORDER BY without LIMIT) are returned
+    without calling the model.
+
     Args:
         sql: SQL query to optimize for cost and performance
         optimization_goals: Optimization objectives (default: ["cost", "performance"])
@@ -551,7 +713,7 @@ async def find_expensive_queries(
 
 
 # Write-enabled tools (only available if --allow-write is specified)
-if allow_write:
+if config.allow_write:
     
     @mcp.tool()
     @with_gcp_config(GitHubIntegrationTools)
@@ -583,19 +745,24 @@ if allow_write:
         pass
 
     @mcp.tool()
+    @with_alert_batching()
     @with_gcp_config(SlackIntegrationTools)
     async def send_cost_alert(
         alert_type: str,
         cost_data: Dict[str, Any],
         severity: str = "medium",
         channel: str = "#data-ops-alerts",
-        mention_users: List[str] = None,
+        mention_users: Tuple[str, ...] = _DEFAULT_MENTION_USERS,
         include_remediation: bool = True,
         project_id: str = None,
+        flush_immediately: bool = False,
     ) -> str:
         """
         Send intelligent cost alerts to Slack with rich context and remediation suggestions.
 
+        Non-critical alerts for the same channel within 5 seconds are delivered
+        together as one message.
+
         Args:
             alert_type: Type of alert ("anomaly", "budget_warning", "optimization_opportunity")
             cost_data: Cost analysis data to include in alert message
@@ -604,15 +771,18 @@ if allow_write:
             mention_users: List of users to mention in the alert (default: [])
             include_remediation: Include suggested remediation steps (default: true)
             project_id: GCP project ID for context
+            flush_immediately: Deliver now instead of batching with other alerts (default: false)
 
         Returns:
-            JSON string with Slack alert delivery result
+            JSON string with Slack alert delivery result, or a queued
+            acknowledgement when the alert joins a batch
         """
         # Function body is handled by the decorator
         pass
 
 
 @mcp.tool()
+@with_result_cache("model_path")
 @with_gcp_config(DBTIntegrationTools)
 async def get_dbt_model_costs(
     model_path: str = None,
@@ -622,6 +792,7 @@ async def get_dbt_model_costs(
     suggest_optimizations: bool = True,
     project_id: str = None,
     region: str = None,
+    cache_bypass: bool = False,
 ) -> str:
     """
     Analyze costs associated with dbt models and provide optimization recommendations.
@@ -634,6 +805,7 @@ async def get_dbt_model_costs(
         suggest_optimizations: Include optimization recommendations (default: true)
         project_id: GCP project ID for analysis
         region: GCP region for analysis
+        cache_bypass: Skip the 5-minute result cache for a specific model (default: false)
 
     Returns:
         JSON string with dbt model cost analysis
@@ -677,7 +849,7 @@ async def monitor_sla_compliance(
 async def forecast_costs(
     forecast_days: int = 30,
     include_confidence_intervals: bool = True,
-    breakdown_by: List[str] = None,
+    breakdown_by: Tuple[str, ...] = _DEFAULT_BREAKDOWN_BY,
     scenario_analysis: bool = False,
     budget_recommendations: bool = True,
     project_id: str = None,
@@ -703,7 +875,7 @@ async def forecast_costs(
 
 
 # Multi-agent tools (only available if --enable-multi-agent is specified)
-if enable_agents:
+if config.enable_agents:
     
     @mcp.tool()
     @with_gcp_config(AgentManagementTools)
@@ -711,7 +883,7 @@ if enable_agents:
         agent_type: str,
         monitoring_interval: int = 300,
         auto_optimize: bool = False,
-        notification_channels: List[str] = None,
+        notification_channels: Tuple[str, ...] = _DEFAULT_NOTIFICATION_CHANNELS,
         cost_thresholds: Dict[str, float] = None,
         project_id: str = None,
         region: str = None,
@@ -771,7 +943,7 @@ if enable_agents:
 
 def validate_write_permissions(operation_name: str):
     """Validate that write operations are allowed"""
-    if not allow_write:
+    if not config.allow_write:
         raise RuntimeError(
             f"Write operation '{operation_name}' is not allowed. "
             "Use --allow-write to enable write operations."
@@ -780,7 +952,7 @@ def validate_write_permissions(operation_name: str):
 
 def validate_sensitive_data_access(operation_name: str):
     """Validate that sensitive data access is allowed"""
-    if not allow_sensitive:
+    if not config.allow_sensitive:
         raise RuntimeError(
             f"Sensitive data operation '{operation_name}' is not allowed. "
             "Use --allow-sensitive-data-access to enable access to sensitive data."
@@ -789,7 +961,7 @@ def validate_sensitive_data_access(operation_name: str):
 
 def validate_agent_functionality(operation_name: str):
     """Validate that multi-agent functionality is enabled"""
-    if not enable_agents:
+    if not config.enable_agents:
         raise RuntimeError(
             f"Multi-agent operation '{operation_name}' is not available. "
             "Use --enable-multi-agent to enable agent functionality."
@@ -801,6 +973,12 @@ def validate_agent_functionality(operation_name: str):
 # ==============================
 
 
+@lru_cache(maxsize=2)
+def _iso_second(sec: int) -> str:
+    """ISO-8601 UTC timestamp for a whole epoch second, shared by calls within it"""
+    return datetime.fromtimestamp(sec, tz=UTC).isoformat()
+
+
 @mcp.tool()
 async def health_check() -> str:
     """
@@ -811,63 +989,58 @@ async def health_check() -> str:
     """
     health_status = {
         "server": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _iso_second(int(time())),
         "configuration": {
-            "project_id": default_project,
-            "region": default_region,
-            "write_enabled": allow_write,
-            "sensitive_data_enabled": allow_sensitive,
-            "multi_agent_enabled": enable_agents
+            "project_id": config.project_id,
+            "region": config.region,
+            "write_enabled": config.allow_write,
+            "sensitive_data_enabled": config.allow_sensitive,
+            "multi_agent_enabled": config.enable_agents
         },
         "integrations": {}
     }
     
-    try:
-        # Test GCP connectivity
-        test_result = await cost_analysis_tools.health_check()
-        health_status["integrations"]["gcp"] = "healthy" if test_result else "unhealthy"
-    except Exception as e:
-        health_status["integrations"]["gcp"] = f"unhealthy: {str(e)}"
+    # Probe all integrations concurrently; each probe is an independent RPC
+    probes = [("gcp", cost_analysis_tools.health_check)]
+    if config.allow_write:
+        if github_tools:
+            probes.append(("github", github_tools.health_check))
+        if slack_tools:
+            probes.append(("slack", slack_tools.health_check))
+    if config.enable_agents:
+        probes.append(("agents", agent_tools.health_check))
+
+    async def run_probe(check: Callable) -> Any:
+        return await check()
+
+    results = await asyncio.gather(
+        *(run_probe(check) for _, check in probes), return_exceptions=True
+    )
+    for (name, _), result in zip(probes, results, strict=True):
+        if isinstance(result, Exception):
+            health_status["integrations"][name] = f"unhealthy: {str(result)}"
+        else:
+            health_status["integrations"][name] = "healthy" if result else "unhealthy"
     
-    # Test optional integrations
-    if allow_write:
-        try:
-            if github_tools:
-                github_status = await github_tools.health_check()
-                health_status["integrations"]["github"] = "healthy" if github_status else "unhealthy"
-        except Exception as e:
-            health_status["integrations"]["github"] = f"unhealthy: {str(e)}"
-        
-        try:
-            if slack_tools:
-                slack_status = await slack_tools.health_check()
-                health_status["integrations"]["slack"] = "healthy" if slack_status else "unhealthy"
-        except Exception as e:
-            health_status["integrations"]["slack"] = f"unhealthy: {str(e)}"
-    
-    # Test agent functionality
-    if enable_agents:
-        try:
-            agent_status = await agent_tools.health_check()
-            health_status["integrations"]["agents"] = "healthy" if agent_status else "unhealthy"
-        except Exception as e:
-            health_status["integrations"]["agents"] = f"unhealthy: {str(e)}"
-    
-    return str(health_status)
+    return _dumps(health_status)
 
 
 if __name__ == "__main__":
     logger.info("Starting GCP Cost Optimization MCP Server...")
-    logger.info(f"Server configuration: project={default_project}, region={default_region}")
-    logger.info(f"Write operations: {'enabled' if allow_write else 'disabled'}")
-    logger.info(f"Sensitive data access: {'enabled' if allow_sensitive else 'disabled'}")
-    logger.info(f"Multi-agent architecture: {'enabled' if enable_agents else 'disabled'}")
+    logger.info("Server configuration: project=%s, region=%s", config.project_id, config.region)
+    logger.info("Write operations: %s", 'enabled' if config.allow_write else 'disabled')
+    logger.info("Sensitive data access: %s", 'enabled' if config.allow_sensitive else 'disabled')
+    logger.info("Multi-agent architecture: %s", 'enabled' if config.enable_agents else 'disabled')
     
+    if uvloop is not None:
+        # Every tool is I/O bound, so run them on the faster libuv event loop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     try:
         # Run the MCP server
         mcp.run()
     except KeyboardInterrupt:
         logger.info("Server shutdown requested by user")
     except Exception as e:
-        logger.error(f"Server failed to start: {e}")
+        logger.error("Server failed to start: %s", e)
         sys.exit(1)
@@ -0,0 +1,328 @@
+"""
+Decorators shared by the MCP tool handlers in server.py
+
+They hold no server state, so each is configured through its arguments:
+in-process result caching, the optimize_query anti-pattern gate and Slack
+alert batching.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache, partial, wraps
+from time import monotonic
+from typing import Any
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj)
+
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+
+# Whitespace runs outside quoted strings and identifiers, for normalize_sql
+_SQL_WHITESPACE_RE = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)|\s+""")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """Canonicalize SQL text so formatting-only differences share a cache entry.
+
+    Memoized because clients such as dashboards resubmit the same large SQL
+    text, and rescanning it is the costliest part of building a cache key.
+    """
+    return _SQL_WHITESPACE_RE.sub(lambda m: m.group(1) or " ", sql).strip().rstrip(";").rstrip()
+
+
+def is_cacheable(result: Any) -> bool:
+    """Whether a tool result may be cached: a string that is not an error response"""
+    if not isinstance(result, str):
+        return False
+    try:
+        data = _loads(result)
+    except ValueError:
+        return True
+    return not (isinstance(data, dict) and (data.get("success") is False or "error" in data))
+
+
+class TTLCache:
+    """Small LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        self._entries[key] = (monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def with_result_cache(
+    key_arg: str,
+    ttl: float = 300.0,
+    maxsize: int = 4096,
+    side_effect_args: tuple[str, ...] = (),
+    key_defaults: dict[str, Any] | None = None,
+) -> Callable:
+    """
+    Decorator that caches a tool's result in-process for `ttl` seconds.
+
+    Entries are keyed by all tool arguments, with `sql` normalized and missing
+    or empty arguments named in `key_defaults` resolved to their defaults. Calls
+    are not cached when `key_arg` is empty or any of `side_effect_args` is set,
+    and callers can pass cache_bypass=True to force a refresh. Only successful
+    results are cached: neither errors raised by the tool nor error responses
+    such as {"success": false, ...} are kept. Concurrent cache misses for the
+    same key share a single in-flight call, so a burst of identical requests
+    reaches the tool once.
+
+    Args:
+        key_arg: Argument that must be given for the call to be cacheable
+        ttl: Seconds a cached result stays valid
+        maxsize: Maximum number of cached results
+        side_effect_args: Arguments that trigger side effects when truthy
+        key_defaults: Values used in the key for arguments that are missing or empty
+    """
+    cache = TTLCache(maxsize, ttl)
+    key_defaults = key_defaults or {}
+    inflight: dict[str, asyncio.Future[Any]] = {}
+
+    def finish(key: str, call: asyncio.Future[Any]) -> None:
+        inflight.pop(key, None)
+        if not call.cancelled():
+            call.exception()  # Retrieved here too, in case every waiter was cancelled
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            cache_bypass = kwargs.pop("cache_bypass", False)
+            if not kwargs.get(key_arg) or any(kwargs.get(name) for name in side_effect_args):
+                return await func(*args, **kwargs)
+
+            key_items = dict(kwargs)
+            for name, default in key_defaults.items():
+                key_items[name] = kwargs.get(name) or default
+            if "sql" in key_items:
+                key_items["sql"] = normalize_sql(key_items["sql"])
+            key = hashlib.blake2b(
+                repr(sorted(key_items.items())).encode(), digest_size=16
+            ).hexdigest()
+
+            if not cache_bypass:
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+
+            call = inflight.get(key)
+            if call is None:
+                call = asyncio.ensure_future(func(*args, **kwargs))
+                inflight[key] = call
+                call.add_done_callback(lambda done: finish(key, done))
+            # Shielded so one caller's cancellation does not cancel the shared call
+            result = await asyncio.shield(call)
+            if is_cacheable(result):
+                cache.put(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+# Cheap checks for the anti-patterns optimize_query rewrites. A query that trips
+# none of them is sent back unchanged instead of to the model. The checks err
+# towards matching, since a false match only costs the model call it would
+# have made anyway. A query counts as filtered only when its WHERE clause
+# names a partition pseudo-column, since filters on other columns do not prune
+# the scan, and any join is left to the model to order.
+_ANTIPATTERN_CHECKS: tuple[tuple[str, re.Pattern[str]], ...] = (
+    ("select_star", re.compile(r"\bSELECT\s+(?:DISTINCT\s+)?(?:\w+\.)?\*", re.IGNORECASE)),
+    ("missing_partition_filter", re.compile(
+        r"^(?![\s\S]*\bWHERE\b[\s\S]*\b(?:_PARTITIONTIME|_PARTITIONDATE|_TABLE_SUFFIX)\b)",
+        re.IGNORECASE,
+    )),
+    ("cross_join", re.compile(
+        r"\bCROSS\s+JOIN\b|\bFROM\s+[\w.`-]+(?:\s+(?:AS\s+)?\w+)?\s*,", re.IGNORECASE
+    )),
+    ("join", re.compile(r"\bJOIN\b", re.IGNORECASE)),
+    ("subquery_in_where", re.compile(r"\bWHERE\b[\s\S]*\(\s*SELECT\b", re.IGNORECASE)),
+    ("unbounded_order_by", re.compile(r"^(?=[\s\S]*\bORDER\s+BY\b)(?![\s\S]*\bLIMIT\b)", re.IGNORECASE)),
+)
+
+antipattern_gate_stats = {"checked": 0, "skipped": 0}
+
+
+def detect_antipatterns(sql: str) -> list[str]:
+    """Names of the anti-pattern checks that match the given SQL"""
+    sql = normalize_sql(sql)
+    return [name for name, pattern in _ANTIPATTERN_CHECKS if pattern.search(sql)]
+
+
+def with_antipattern_gate(sql_arg: str = "sql") -> Callable:
+    """
+    Decorator that skips an optimization tool when its SQL has no known anti-pattern.
+
+    Such queries are returned unchanged in the tool's usual response shape, with
+    no savings and no techniques, instead of going through the model, which is
+    the slow and billed part of the tool.
+
+    Args:
+        sql_arg: Argument holding the SQL to check
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            sql = kwargs.get(sql_arg)
+            if not sql:
+                return await func(*args, **kwargs)
+
+            stats = antipattern_gate_stats
+            stats["checked"] += 1
+            if detect_antipatterns(sql):
+                return await func(*args, **kwargs)
+
+            stats["skipped"] += 1
+            logger.debug(
+                "Skipped %s: no anti-patterns detected (%d/%d skipped)",
+                func.__name__, stats["skipped"], stats["checked"],
+            )
+            return _dumps({
+                "success": True,
+                "original_query": sql,
+                "optimized_query": sql,
+                "estimated_savings_usd": 0.0,
+                "estimated_savings_pct": 0.0,
+                "optimization_techniques": [],
+                "explanation": "No known cost anti-pattern found; the query is already partition-filtered.",
+                "risk_level": "LOW",
+            })
+
+        return wrapper
+
+    return decorator
+
+
+_SEVERITY_ORDER = ("low", "medium", "high", "critical")
+
+
+def merge_alerts(alerts: list[dict[str, Any]]) -> dict[str, Any]:
+    """Combine queued send_cost_alert arguments into one multi-alert call"""
+    alert_types = {alert.get("alert_type") for alert in alerts}
+    merged = dict(alerts[0])
+    merged["alert_type"] = alerts[0].get("alert_type") if len(alert_types) == 1 else "multiple"
+    merged["severity"] = max(
+        (alert.get("severity", "medium") for alert in alerts),
+        key=lambda level: _SEVERITY_ORDER.index(level) if level in _SEVERITY_ORDER else 0,
+    )
+    merged["mention_users"] = tuple(
+        dict.fromkeys(user for alert in alerts for user in alert.get("mention_users", ()))
+    )
+    merged["include_remediation"] = any(alert.get("include_remediation", True) for alert in alerts)
+    merged["cost_data"] = {
+        "alerts": [
+            {
+                "alert_type": alert.get("alert_type"),
+                "severity": alert.get("severity", "medium"),
+                "cost_data": alert.get("cost_data"),
+            }
+            for alert in alerts
+        ]
+    }
+    return merged
+
+
+def with_alert_batching(
+    window: float = 5.0,
+    immediate_severities: tuple[str, ...] = ("critical",),
+) -> Callable:
+    """
+    Decorator that coalesces alerts sent to the same channel within `window` seconds.
+
+    The first alert for a channel and project opens a batch; alerts arriving
+    before the window closes join it and are delivered together as one message,
+    which keeps bursts under Slack's per-channel rate limit. Batched calls return
+    as soon as the alert is queued, and delivery failures are logged. Alerts with
+    an immediate severity, or sent with flush_immediately=True, bypass batching
+    and return the delivery result.
+
+    Args:
+        window: Seconds to collect alerts before delivering a batch
+        immediate_severities: Severities delivered without waiting
+    """
+    pending: dict[tuple[Any, Any], list[dict[str, Any]]] = {}
+    flushers: set[asyncio.Task[None]] = set()
+
+    def decorator(func: Callable) -> Callable:
+        async def flush(key: tuple[Any, Any], batch: list[dict[str, Any]]) -> None:
+            await asyncio.sleep(window)
+            del pending[key]
+            try:
+                await func(**(batch[0] if len(batch) == 1 else merge_alerts(batch)))
+            except Exception as e:
+                logger.error("Failed to deliver %d batched alert(s) to %s: %s", len(batch), key[0], e)
+
+        def finish(key: tuple[Any, Any], batch: list[dict[str, Any]], flusher: asyncio.Task[None]) -> None:
+            # Runs even when the flusher is cancelled before it starts; a newer
+            # batch may already be pending under the same key
+            flushers.discard(flusher)
+            if flusher.cancelled():
+                if pending.get(key) is batch:
+                    del pending[key]
+                logger.warning(
+                    "Alert batch for %s cancelled; %d alert(s) may not be delivered", key[0], len(batch)
+                )
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            flush_immediately = kwargs.pop("flush_immediately", False)
+            if args or flush_immediately or kwargs.get("severity") in immediate_severities:
+                return await func(*args, **kwargs)
+
+            key = (kwargs.get("channel"), kwargs.get("project_id"))
+            batch = pending.get(key)
+            if batch is None:
+                batch = pending[key] = []
+                flusher = asyncio.create_task(flush(key, batch))
+                flushers.add(flusher)
+                flusher.add_done_callback(partial(finish, key, batch))
+            batch.append(kwargs)
+            return _dumps({
+                "success": True,
+                "queued": True,
+                "channel": key[0],
+                "alerts_in_batch": len(batch),
+                "deliver_within_seconds": window,
+            })
+
+        return wrapper
+
+    return decorator
@@ -16,6 +16,7 @@ from concurrent.futures import ThreadPoolExecutor
 
 from fastmcp import FastMCP
 from google.cloud import bigquery
+from bigquery_client import get_bq_client
 
 
 # Data Classes for Type Safety
@@ -46,7 +47,7 @@ class BigQueryAnalyzer:
     
     def __init__(self, project_id: str):
         self.project_id = project_id
-        self.client = bigquery.Client(project=project_id)
+        self.client = get_bq_client(project_id)
         self.executor = ThreadPoolExecutor(max_workers=3)
     
     # SQL Query Templates
@@ -7,10 +7,40 @@ Provides common BigQuery operations and utilities.
 import os
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from dataclasses import dataclass
+from functools import cache, lru_cache
 from google.cloud import bigquery
 
+try:
+    from google.cloud import bigquery_storage
+except ImportError:
+    bigquery_storage = None
+
+
+@cache
+def get_bq_client(project_id: str) -> bigquery.Client:
+    """
+    Return the shared bigquery.Client for a project.
+    
+    Clients are thread-safe, so every tool class reuses one per project instead
+    of repeating credential discovery and connection setup.
+    """
+    return bigquery.Client(project=project_id)
+
+
+@lru_cache(maxsize=1)
+def get_bqstorage_client() -> Optional["bigquery_storage.BigQueryReadClient"]:
+    """
+    Return the shared BigQuery Storage Read API client, if the package is installed.
+    
+    Large result sets are downloaded as Arrow record batches through this
+    client instead of being paged through the REST API as row JSON.
+    """
+    if bigquery_storage is None:
+        return None
+    return bigquery_storage.BigQueryReadClient()
+
 
 @dataclass
 class QueryConfig:
@@ -51,12 +81,14 @@ class UnifiedBigQueryClient:
     Shared across all MCP servers for consistency.
     """
     
-    def __init__(self, project_id: Optional[str] = None):
+    def __init__(self, project_id: Optional[str] = None, use_query_api: bool = True):
         self.project_id = project_id or os.getenv("GOOGLE_CLOUD_PROJECT")
         if not self.project_id:
             raise ValueError("GOOGLE_CLOUD_PROJECT environment variable required")
         
-        self.client = bigquery.Client(project=self.project_id)
+        self.client = get_bq_client(self.project_id)
+        # Older google-cloud-bigquery releases have no query_and_wait
+        self.use_query_api = use_query_api and hasattr(self.client, "query_and_wait")
         
         # Standard SQL fragments
         self.COST_CALCULATION = "total_bytes_processed / POW(10, 12) * 6.25"
@@ -67,17 +99,30 @@ class UnifiedBigQueryClient:
             AND total_bytes_processed IS NOT NULL
         """
     
-    def execute_query(self, query: str, timeout: int = 60) -> List[Any]:
-        """Execute BigQuery query with timeout and error handling."""
+    def execute_query(self, query: str, timeout: int = 60,
+                      use_query_api: Optional[bool] = None) -> List[Any]:
+        """
+        Execute BigQuery query with timeout and error handling.
+        
+        By default small queries go through jobs.query (query_and_wait), which
+        returns results inline when they finish within the timeout instead of
+        inserting a job and polling for its results.
+        """
         try:
             job_config = bigquery.QueryJobConfig(
                 use_query_cache=True,
                 maximum_bytes_billed=100 * 1024**4  # 100 TB limit
             )
+            if use_query_api is None:
+                use_query_api = self.use_query_api
+            if use_query_api:
+                return list(self.client.query_and_wait(
+                    query, job_config=job_config, wait_timeout=timeout
+                ))
             query_job = self.client.query(query, job_config=job_config)
             return list(query_job.result(timeout=timeout))
         except Exception as e:
-            raise Exception(f"BigQuery execution error: {str(e)}")
+            raise Exception(f"BigQuery execution error: {str(e)}") from e
     
     def dry_run_query(self, query: str) -> Dict[str, Any]:
         """Perform dry run to validate query and estimate cost."""
@@ -348,6 +393,118 @@ def create_standard_response(success: bool, data: Dict[str, Any],
     return json.dumps(response, indent=2)
 
 
+def build_expensive_queries_sql(project_id: str, days: int, min_cost_threshold: float,
+                                limit: int = 100) -> str:
+    """
+    Build the expensive-queries SQL shared by the report and streaming variants.
+    
+    The cost threshold and row limit are applied in BigQuery, so only the
+    requested rows are returned from JOBS_BY_PROJECT.
+    """
+    return f"""
+    WITH expensive_queries AS (
+        SELECT 
+            job_id,
+            user_email,
+            creation_time,
+            LEFT(query, 2000) as query_text,
+            statement_type,
+            total_bytes_processed,
+            total_bytes_processed / POW(10, 12) * 6.25 as cost_usd,
+            TIMESTAMP_DIFF(end_time, start_time, MILLISECOND) as duration_ms,
+            COALESCE(total_slot_ms / TIMESTAMP_DIFF(end_time, start_time, MILLISECOND), 0) as avg_slots,
+            destination_table.dataset_id as target_dataset,
+            destination_table.table_id as target_table,
+            cache_hit,
+            reservation_id,
+            
+            -- Cost driver classification
+            CASE 
+                WHEN total_bytes_processed / POW(10, 12) > 10 THEN 'DATA_VOLUME_HEAVY'
+                WHEN COALESCE(total_slot_ms / TIMESTAMP_DIFF(end_time, start_time, MILLISECOND), 0) > 2000 THEN 'COMPUTE_INTENSIVE'
+                WHEN total_bytes_processed / POW(10, 12) > 1 AND COALESCE(total_slot_ms / TIMESTAMP_DIFF(end_time, start_time, MILLISECOND), 0) > 500 THEN 'MIXED_HEAVY'
+                ELSE 'MODERATE_USAGE'
+            END as cost_driver_type,
+            
+            -- Usage pattern classification  
+            CASE 
+                WHEN job_id LIKE '%airflow%' OR job_id LIKE '%scheduled%' THEN 'ETL_SCHEDULED'
+                WHEN user_email LIKE '%gserviceaccount.com' THEN 'SERVICE_ACCOUNT'
+                WHEN query LIKE '%LIMIT%' AND query LIKE '%ORDER BY%' THEN 'EXPLORATORY'
+                WHEN statement_type IN ('CREATE_TABLE_AS_SELECT', 'INSERT') THEN 'DATA_PIPELINE'
+                ELSE 'AD_HOC_ANALYSIS'
+            END as usage_pattern,
+            
+            -- Optimization opportunity classification
+            CASE 
+                WHEN query LIKE '%SELECT *%' AND total_bytes_processed / POW(10, 12) > 1 THEN 'COLUMN_PRUNING'
+                WHEN query NOT LIKE '%WHERE%' AND total_bytes_processed / POW(10, 12) > 5 THEN 'MISSING_FILTERS'
+                WHEN query LIKE '%JOIN%' AND (query LIKE '%SELECT *%' OR NOT query LIKE '%WHERE%') THEN 'JOIN_OPTIMIZATION'
+                WHEN NOT cache_hit AND query LIKE '%GROUP BY%' THEN 'CACHING_OPPORTUNITY'
+                WHEN query LIKE '%ORDER BY%' AND NOT query LIKE '%LIMIT%' THEN 'RESULT_LIMITING'
+                ELSE 'GENERAL_OPTIMIZATION'
+            END as optimization_category
+            
+        FROM `{project_id}.region-us.INFORMATION_SCHEMA.JOBS_BY_PROJECT`
+        WHERE creation_time >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {days} DAY)
+            AND job_type = 'QUERY'
+            AND state = 'DONE'
+            AND error_result IS NULL
+            AND total_bytes_processed IS NOT NULL
+            AND total_bytes_processed / POW(10, 12) * 6.25 >= {min_cost_threshold}
+            AND query IS NOT NULL
+    )
+    SELECT * FROM expensive_queries
+    ORDER BY cost_usd DESC
+    LIMIT {int(limit)}
+    """
+
+def expensive_query_entry(row: Any) -> Dict[str, Any]:
+    """Convert an expensive-queries result row into its JSON-ready entry."""
+    return {
+        "job_id": row.job_id,
+        "user_email": row.user_email,
+        "creation_time": row.creation_time.isoformat(),
+        "cost_usd": round(row.cost_usd, 2),
+        "duration_ms": row.duration_ms,
+        "avg_slots": round(row.avg_slots, 2),
+        "cost_driver_type": row.cost_driver_type,
+        "usage_pattern": row.usage_pattern,
+        "optimization_category": row.optimization_category,
+        "target_table": f"{row.target_dataset}.{row.target_table}" if row.target_dataset else None,
+        "cache_hit": row.cache_hit,
+        "query_preview": row.query_text[:500] + "..." if len(row.query_text) > 500 else row.query_text
+    }
+
+
+def iter_expensive_queries(project_id: str, days: int = 7, min_cost_threshold: float = 10.0,
+                           page_size: int = 100, limit: int = 100) -> Iterator[Dict[str, Any]]:
+    """
+    Stream expensive queries one at a time instead of building a full report.
+    
+    Runs the same query as analyze_expensive_queries and yields each query
+    entry as soon as its result page arrives, so callers can print rows
+    without holding the whole result set in memory.
+    
+    Args:
+        project_id: GCP project whose jobs are analyzed
+        days: Number of days to analyze (1-30, default: 7)
+        min_cost_threshold: Minimum cost to be considered expensive (default: 10.0)
+        page_size: Rows fetched per BigQuery result page (default: 100)
+        limit: Maximum number of queries to yield (default: 100)
+    
+    Yields:
+        Query entry dicts, most expensive first
+    """
+    if not 1 <= days <= 30:
+        raise ValueError("Days must be between 1 and 30")
+    
+    query = build_expensive_queries_sql(project_id, days, min_cost_threshold, limit)
+    rows = get_bq_client(project_id).query(query).result(page_size=page_size, max_results=limit)
+    for row in rows:
+        yield expensive_query_entry(row)
+
+
 # Singleton instance for reuse across servers
 _client_instance = None
 
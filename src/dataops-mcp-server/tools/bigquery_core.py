@@ -76,9 +76,9 @@ if not project_id:
 
 try:
     bq_client = UnifiedBigQueryClient(project_id=project_id)
-    logger.info(f"Successfully initialized BigQuery client for project: {project_id}")
+    logger.info("Successfully initialized BigQuery client for project: %s", project_id)
 except Exception as e:
-    logger.error(f"Failed to initialize BigQuery client: {e}")
+    logger.error("Failed to initialize BigQuery client: %s", e)
     raise RuntimeError(f"Failed to initialize BigQuery client: {e}")
 
 
@@ -924,7 +924,7 @@ For more information, visit: https://github.com/your-org/dataops-mcp-server
     # Set project ID if provided
     if args.project:
         os.environ["GOOGLE_CLOUD_PROJECT"] = args.project
-        main_logger.info(f"Using project ID: {args.project}")
+        main_logger.info("Using project ID: %s", args.project)
     
     # Validate environment
     if not os.getenv("GOOGLE_CLOUD_PROJECT"):
@@ -948,17 +948,17 @@ For more information, visit: https://github.com/your-org/dataops-mcp-server
                 print(json.dumps(health_data, indent=2))
                 exit(1)
         except Exception as e:
-            main_logger.error(f"Health check error: {e}")
+            main_logger.error("Health check error: %s", e)
             print(f"❌ Health check error: {e}")
             exit(1)
     
     # Start the MCP server
     try:
-        main_logger.info(f"Starting BigQuery Core MCP Server for project: {project_id}")
+        main_logger.info("Starting BigQuery Core MCP Server for project: %s", project_id)
         main_logger.info("Available tools: health_check, get_daily_costs, get_top_users, get_cost_summary")
         mcp.run()
     except KeyboardInterrupt:
         main_logger.info("Server shutting down...")
     except Exception as e:
-        main_logger.error(f"Server error: {e}")
+        main_logger.error("Server error: %s", e)
         raise
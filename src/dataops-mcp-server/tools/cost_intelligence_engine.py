@@ -5,10 +5,14 @@ Cost Intelligence Engine - Enhanced BigQuery Cost Analysis
 Replaces the basic bigquery_tools.py with AI-powered cost intelligence
 """
 
+import bisect
 import os
 import json
+import threading
+import time
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Sequence, Tuple, Union, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -16,7 +20,9 @@ from enum import Enum
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+import numpy as np
 from google.cloud import bigquery
+from bigquery_client import get_bq_client, get_bqstorage_client
 
 # ============================================================================
 # ENHANCED ARCHITECTURE COMPONENTS
@@ -52,6 +58,77 @@ class CostForecast:
     confidence_score: float
     key_drivers: List[str]
 
+@dataclass(frozen=True)
+class SpendingSeries:
+    """Daily query spend held column-wise, oldest day first"""
+    dates: np.ndarray  # datetime64[D]
+    costs: np.ndarray  # float64, USD
+    query_counts: np.ndarray  # int64
+    
+    def __len__(self) -> int:
+        return len(self.dates)
+
+# ============================================================================
+# ANOMALY DETECTION HELPERS
+# ============================================================================
+
+# Z-score above which a day's spend is anomalous, per sensitivity level
+ZSCORE_THRESHOLDS = {"low": 3.0, "medium": 2.5, "high": 2.0}
+
+# Trailing days used as the baseline for each day's z-score
+BASELINE_WINDOW_DAYS = 7
+
+# Size of the short confirmation window relative to the baseline window
+SECONDARY_WINDOW_FRACTION = 0.25
+
+# Seconds a fetched spend time series is reused; each fetch is a billed
+# INFORMATION_SCHEMA scan
+SPENDING_CACHE_TTL_SECONDS = 300
+
+# Severity ladder over |z| / threshold: above each break the next label applies
+SEVERITY_BREAKS = (1.5, 2.5)
+SEVERITY_LABELS = ("MEDIUM", "HIGH", "CRITICAL")
+
+# Rank of each severity label, for ordering anomalies most severe first
+SEVERITY_SCORES = {"LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
+
+def severity_for_zscore(z_score: float, threshold: float) -> str:
+    """Severity label of an anomaly whose z-score already exceeds `threshold`"""
+    return SEVERITY_LABELS[bisect.bisect_left(SEVERITY_BREAKS, abs(z_score) / threshold)]
+
+def rolling_zscores(costs: np.ndarray, windows: Sequence[int]) -> List[np.ndarray]:
+    """
+    Z-scores of each value against the `window` values immediately before it,
+    for each window size in `windows`.
+    
+    Every trailing window's mean and sample standard deviation come from
+    prefix sums of the values and their squares. The prefix sums are built
+    once and shared by all window sizes, so the series is scored in O(N) per
+    window regardless of its size. Values with fewer than `window`
+    predecessors, or whose baseline has (numerically) zero variance, get NaN.
+    """
+    n = len(costs)
+    if n == 0:
+        return [np.full(costs.shape, np.nan) for _ in windows]
+    
+    # Z-scores are shift invariant; centring keeps the squared sums well conditioned
+    centred = costs - costs.mean()
+    cs = np.concatenate(([0.0], np.cumsum(centred)))
+    cs2 = np.concatenate(([0.0], np.cumsum(centred * centred)))
+    tolerance = 1e-9 * max(float(np.abs(costs).max()), 1.0)
+    
+    results = []
+    for window in windows:
+        zscores = np.full(costs.shape, np.nan)
+        if 2 <= window < n:
+            means = (cs[window:-1] - cs[:-window - 1]) / window
+            variances = ((cs2[window:-1] - cs2[:-window - 1]) - window * means * means) / (window - 1)
+            stds = np.sqrt(np.maximum(variances, 0.0))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                zscores[window:] = np.where(stds > tolerance, (centred[window:] - means) / stds, np.nan)
+        results.append(zscores)
+    return results
+
 # ============================================================================
 # COST INTELLIGENCE ENGINE
 # ============================================================================
@@ -59,9 +136,13 @@ class CostForecast:
 class CostIntelligenceEngine:
     """Advanced cost analytics with ML-powered insights"""
     
+    # Spend time series by (project_id, days), as (expires_at, series); shared by all instances
+    _spending_cache: Dict[Tuple[str, int], Tuple[float, SpendingSeries]] = {}
+    _spending_cache_lock = threading.Lock()
+    
     def __init__(self, project_id: str):
         self.project_id = project_id
-        self.bq_client = bigquery.Client(project=project_id)
+        self.bq_client = get_bq_client(project_id)
         
     def analyze_cost_trends_with_forecasting(
         self,
@@ -128,7 +209,9 @@ class CostIntelligenceEngine:
             anomalies = []
             
             if "statistical_threshold" in algorithms:
-                stat_anomalies = self._detect_statistical_anomalies(spending_data, sensitivity)
+                stat_anomalies = self._detect_statistical_anomalies(
+                    spending_data, sensitivity, detection_window_days
+                )
                 anomalies.extend(stat_anomalies)
             
             if "isolation_forest" in algorithms:
@@ -139,6 +222,12 @@ class CostIntelligenceEngine:
                 ts_anomalies = self._detect_time_series_anomalies(spending_data)
                 anomalies.extend(ts_anomalies)
             
+            # One anomaly per date, most severe first; ties broken by the size of the deviation
+            anomalies = self._deduplicate_anomalies(anomalies)
+            anomalies.sort(
+                key=lambda a: (a.get("severity_score", 0), abs(a.get("z_score", 0))), reverse=True
+            )
+            
             # Context enrichment
             if context_enrichment:
                 enriched_anomalies = self._enrich_anomaly_context(anomalies)
@@ -378,6 +467,209 @@ class CostIntelligenceEngine:
         
         return [asdict(insight) for insight in insights]
     
+    def _get_spending_timeseries(self, days: int) -> SpendingSeries:
+        """
+        Daily query spend for the last `days` days, oldest first
+        
+        Results are cached per project and period for SPENDING_CACHE_TTL_SECONDS
+        and shared between callers, so treat the arrays as read-only.
+        """
+        key = (self.project_id, days)
+        with self._spending_cache_lock:
+            cached = self._spending_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
+        series = self._fetch_spending_timeseries(days)
+        with self._spending_cache_lock:
+            self._spending_cache[key] = (time.monotonic() + SPENDING_CACHE_TTL_SECONDS, series)
+        return series
+    
+    def _fetch_spending_timeseries(self, days: int) -> SpendingSeries:
+        """Query BigQuery for the daily spend time series, bypassing the cache"""
+        spending_query = f"""
+        SELECT 
+            DATE(creation_time) as date,
+            SUM(total_bytes_processed) / POW(10, 12) * 6.25 as cost_usd,
+            COUNT(*) as query_count
+        FROM `{self.project_id}.region-us.INFORMATION_SCHEMA.JOBS_BY_PROJECT`
+        WHERE creation_time >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {days} DAY)
+            AND job_type = 'QUERY'
+            AND state = 'DONE'
+            AND error_result IS NULL
+            AND total_bytes_processed IS NOT NULL
+        GROUP BY date
+        ORDER BY date
+        """
+        
+        # Columns arrive as Arrow buffers (via the Storage Read API when installed)
+        table = self.bq_client.query(spending_query).to_arrow(
+            bqstorage_client=get_bqstorage_client(),
+            create_bqstorage_client=False
+        )
+        return SpendingSeries(
+            dates=table.column("date").to_numpy().astype("datetime64[D]"),
+            costs=table.column("cost_usd").fill_null(0).to_numpy().astype(np.float64),
+            query_counts=table.column("query_count").to_numpy().astype(np.int64)
+        )
+    
+    def _deduplicate_anomalies(self, anomalies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keep the strongest anomaly per date, listing every algorithm that flagged it
+        
+        Done in a single pass: each date keeps its best record so far and the
+        set of algorithms seen for it.
+        """
+        best: Dict[str, Dict[str, Any]] = {}
+        algorithms: Dict[str, set] = {}
+        for anomaly in anomalies:
+            date = anomaly["date"]
+            algorithms.setdefault(date, set()).add(anomaly["algorithm"])
+            current = best.get(date)
+            if current is None or (
+                (anomaly.get("severity_score", 0), abs(anomaly.get("z_score", 0)))
+                > (current.get("severity_score", 0), abs(current.get("z_score", 0)))
+            ):
+                best[date] = anomaly
+        
+        return [
+            {**anomaly, "detected_by": sorted(algorithms[date])}
+            for date, anomaly in best.items()
+        ]
+    
+    def _calculate_severity_distribution(self, anomalies: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Number of anomalies at each severity level, most severe first"""
+        counts = Counter(anomaly["severity"] for anomaly in anomalies)
+        return {
+            severity: counts[severity]
+            for severity in sorted(SEVERITY_SCORES, key=SEVERITY_SCORES.get, reverse=True)
+            if severity in counts
+        }
+    
+    def _enrich_anomaly_context(self, anomalies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Attach the top spenders and datasets of each anomaly's day"""
+        breakdowns = self._get_anomaly_dates_breakdown(sorted({a["date"] for a in anomalies}))
+        return [
+            {**anomaly, "context": breakdowns.get(anomaly["date"], {})}
+            for anomaly in anomalies
+        ]
+    
+    def _get_anomaly_dates_breakdown(self, dates: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-date spend breakdown by user and dataset for the given ISO dates
+        
+        All dates are fetched in one scan rather than one query per anomaly, and
+        the ranking is done in SQL so only one summary row per date comes back.
+        """
+        if not dates:
+            return {}
+        
+        breakdown_query = f"""
+        WITH jobs AS (
+            SELECT 
+                DATE(creation_time) as date,
+                user_email,
+                IFNULL(destination_table.dataset_id, '(none)') as dataset_id,
+                total_bytes_processed / POW(10, 12) * 6.25 as cost_usd
+            FROM `{self.project_id}.region-us.INFORMATION_SCHEMA.JOBS_BY_PROJECT`
+            WHERE DATE(creation_time) IN UNNEST(@dates)
+                AND job_type = 'QUERY'
+                AND state = 'DONE'
+                AND error_result IS NULL
+                AND total_bytes_processed IS NOT NULL
+        ),
+        by_user AS (
+            SELECT date, user_email, SUM(cost_usd) as user_cost, MAX(cost_usd) as max_query_cost
+            FROM jobs
+            GROUP BY date, user_email
+        ),
+        by_dataset AS (
+            SELECT date, dataset_id, SUM(cost_usd) as ds_cost
+            FROM jobs
+            GROUP BY date, dataset_id
+        ),
+        user_summary AS (
+            SELECT 
+                date,
+                ARRAY_AGG(STRUCT(user_email, user_cost) ORDER BY user_cost DESC LIMIT 1)[OFFSET(0)] as top_user_row,
+                SUM(user_cost) as total_cost,
+                MAX(max_query_cost) as max_query_cost
+            FROM by_user
+            GROUP BY date
+        ),
+        dataset_summary AS (
+            SELECT 
+                date,
+                ARRAY_AGG(STRUCT(dataset_id, ds_cost) ORDER BY ds_cost DESC LIMIT 3) as top_datasets
+            FROM by_dataset
+            GROUP BY date
+        )
+        SELECT 
+            u.date,
+            u.top_user_row.user_email as top_user,
+            u.top_user_row.user_cost as top_user_cost,
+            u.max_query_cost,
+            d.top_datasets,
+            SAFE_DIVIDE(d.top_datasets[OFFSET(0)].ds_cost, u.total_cost) as dataset_concentration
+        FROM user_summary u
+        JOIN dataset_summary d USING (date)
+        """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ArrayQueryParameter("dates", "DATE", dates)]
+        )
+        
+        return {
+            row.date.isoformat(): {
+                "top_user": row.top_user,
+                "top_user_cost_usd": round(float(row.top_user_cost or 0), 2),
+                "max_query_cost_usd": round(float(row.max_query_cost or 0), 2),
+                "top_datasets": [
+                    {"dataset_id": ds["dataset_id"], "cost_usd": round(float(ds["ds_cost"] or 0), 2)}
+                    for ds in row.top_datasets
+                ],
+                "dataset_concentration": round(float(row.dataset_concentration or 0), 3)
+            }
+            for row in self.bq_client.query(breakdown_query, job_config=job_config)
+        }
+    
+    def _detect_statistical_anomalies(
+        self, 
+        spending_data: SpendingSeries, 
+        sensitivity: str,
+        window_days: int = BASELINE_WINDOW_DAYS,
+        secondary_window_fraction: float = SECONDARY_WINDOW_FRACTION
+    ) -> List[Dict[str, Any]]:
+        """
+        Flag days whose spend deviates from both a long and a short trailing baseline
+        
+        A spike inflates the long window's baseline for `window_days` afterwards,
+        which would mask the days that follow it. Requiring the short window to
+        agree lets detection recover once the spike has left the short window.
+        """
+        threshold = ZSCORE_THRESHOLDS.get(sensitivity, ZSCORE_THRESHOLDS["medium"])
+        costs = spending_data.costs
+        long_window = min(window_days, len(costs) - 1)
+        short_window = max(2, int(long_window * secondary_window_fraction))
+        z_long, z_short = rolling_zscores(costs, (long_window, short_window))
+        
+        fired = (np.abs(np.nan_to_num(z_long)) > threshold) & (np.abs(np.nan_to_num(z_short)) > threshold)
+        
+        anomalies = []
+        for i in np.flatnonzero(fired):
+            z = float(z_short[i])
+            severity = severity_for_zscore(z, threshold)
+            anomalies.append({
+                "date": str(spending_data.dates[i]),
+                "algorithm": "statistical_threshold",
+                "cost_usd": round(float(costs[i]), 2),
+                "z_score": round(z, 2),
+                "z_score_long_window": round(float(z_long[i]), 2),
+                "direction": "SPIKE" if z > 0 else "DROP",
+                "severity": severity,
+                "severity_score": SEVERITY_SCORES[severity]
+            })
+        return anomalies
+    
     def _generate_cost_forecast(self, historical_data: List[Any]) -> CostForecast:
         """Generate ML-powered cost forecast"""
         # Simplified forecasting logic (replace with actual ML model)
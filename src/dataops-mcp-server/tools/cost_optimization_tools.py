@@ -9,13 +9,20 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 
+from bigquery_client import build_expensive_queries_sql, expensive_query_entry
+from forecast_models import forecast_models
+
 # Add these tools to your existing MCP server
 
+# Rows per result page when reading whole result sets
+_RESULT_PAGE_SIZE = 1000
+
 @mcp.tool()
 def analyze_expensive_queries(
     days: int = 7,
     min_cost_threshold: float = 10.0,
-    categorize_by: str = "cost_driver"  # cost_driver | usage_pattern | optimization_opportunity
+    categorize_by: str = "cost_driver",  # cost_driver | usage_pattern | optimization_opportunity
+    limit: int = 100
 ) -> str:
     """
     Analyze and categorize expensive queries with optimization recommendations.
@@ -24,6 +31,7 @@ def analyze_expensive_queries(
         days: Number of days to analyze (1-30, default: 7)
         min_cost_threshold: Minimum cost to be considered expensive (default: 10.0)
         categorize_by: Categorization method (cost_driver, usage_pattern, optimization_opportunity)
+        limit: Maximum number of queries to analyze, most expensive first (default: 100)
     
     Returns:
         JSON string with categorized expensive queries and optimization suggestions
@@ -33,65 +41,9 @@ def analyze_expensive_queries(
     
     try:
         # Get expensive queries with detailed metadata
-        query = f"""
-        WITH expensive_queries AS (
-            SELECT 
-                job_id,
-                user_email,
-                creation_time,
-                LEFT(query, 2000) as query_text,
-                statement_type,
-                total_bytes_processed,
-                total_bytes_processed / POW(10, 12) * 6.25 as cost_usd,
-                TIMESTAMP_DIFF(end_time, start_time, MILLISECOND) as duration_ms,
-                COALESCE(total_slot_ms / TIMESTAMP_DIFF(end_time, start_time, MILLISECOND), 0) as avg_slots,
-                destination_table.dataset_id as target_dataset,
-                destination_table.table_id as target_table,
-                cache_hit,
-                reservation_id,
-                
-                -- Cost driver classification
-                CASE 
-                    WHEN total_bytes_processed / POW(10, 12) > 10 THEN 'DATA_VOLUME_HEAVY'
-                    WHEN COALESCE(total_slot_ms / TIMESTAMP_DIFF(end_time, start_time, MILLISECOND), 0) > 2000 THEN 'COMPUTE_INTENSIVE'
-                    WHEN total_bytes_processed / POW(10, 12) > 1 AND COALESCE(total_slot_ms / TIMESTAMP_DIFF(end_time, start_time, MILLISECOND), 0) > 500 THEN 'MIXED_HEAVY'
-                    ELSE 'MODERATE_USAGE'
-                END as cost_driver_type,
-                
-                -- Usage pattern classification  
-                CASE 
-                    WHEN job_id LIKE '%airflow%' OR job_id LIKE '%scheduled%' THEN 'ETL_SCHEDULED'
-                    WHEN user_email LIKE '%gserviceaccount.com' THEN 'SERVICE_ACCOUNT'
-                    WHEN query LIKE '%LIMIT%' AND query LIKE '%ORDER BY%' THEN 'EXPLORATORY'
-                    WHEN statement_type IN ('CREATE_TABLE_AS_SELECT', 'INSERT') THEN 'DATA_PIPELINE'
-                    ELSE 'AD_HOC_ANALYSIS'
-                END as usage_pattern,
-                
-                -- Optimization opportunity classification
-                CASE 
-                    WHEN query LIKE '%SELECT *%' AND total_bytes_processed / POW(10, 12) > 1 THEN 'COLUMN_PRUNING'
-                    WHEN query NOT LIKE '%WHERE%' AND total_bytes_processed / POW(10, 12) > 5 THEN 'MISSING_FILTERS'
-                    WHEN query LIKE '%JOIN%' AND (query LIKE '%SELECT *%' OR NOT query LIKE '%WHERE%') THEN 'JOIN_OPTIMIZATION'
-                    WHEN NOT cache_hit AND query LIKE '%GROUP BY%' THEN 'CACHING_OPPORTUNITY'
-                    WHEN query LIKE '%ORDER BY%' AND NOT query LIKE '%LIMIT%' THEN 'RESULT_LIMITING'
-                    ELSE 'GENERAL_OPTIMIZATION'
-                END as optimization_category
-                
-            FROM `{project_id}.region-us.INFORMATION_SCHEMA.JOBS_BY_PROJECT`
-            WHERE creation_time >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {days} DAY)
-                AND job_type = 'QUERY'
-                AND state = 'DONE'
-                AND error_result IS NULL
-                AND total_bytes_processed IS NOT NULL
-                AND total_bytes_processed / POW(10, 12) * 6.25 >= {min_cost_threshold}
-                AND query IS NOT NULL
-        )
-        SELECT * FROM expensive_queries
-        ORDER BY cost_usd DESC
-        LIMIT 100
-        """
+        query = build_expensive_queries_sql(project_id, days, min_cost_threshold, limit)
         
-        results = list(bq_client.query(query))
+        results = list(bq_client.query(query).result(page_size=_RESULT_PAGE_SIZE))
         
         # Process and categorize results
         categorized_queries = {}
@@ -117,20 +69,7 @@ def analyze_expensive_queries(
                     "avg_cost": 0
                 }
             
-            query_entry = {
-                "job_id": row.job_id,
-                "user_email": row.user_email,
-                "creation_time": row.creation_time.isoformat(),
-                "cost_usd": round(row.cost_usd, 2),
-                "duration_ms": row.duration_ms,
-                "avg_slots": round(row.avg_slots, 2),
-                "cost_driver_type": row.cost_driver_type,
-                "usage_pattern": row.usage_pattern,
-                "optimization_category": row.optimization_category,
-                "target_table": f"{row.target_dataset}.{row.target_table}" if row.target_dataset else None,
-                "cache_hit": row.cache_hit,
-                "query_preview": row.query_text[:500] + "..." if len(row.query_text) > 500 else row.query_text
-            }
+            query_entry = expensive_query_entry(row)
             
             categorized_queries[category_key]["queries"].append(query_entry)
             categorized_queries[category_key]["total_cost"] += row.cost_usd
@@ -565,71 +504,17 @@ def create_cost_forecast(
         return json.dumps({"error": "Forecast days must be between 1 and 365"})
     
     try:
-        # Get historical daily costs
-        query = f"""
-        WITH daily_costs AS (
-            SELECT 
-                DATE(creation_time) as date,
-                COUNT(*) as query_count,
-                SUM(total_bytes_processed) / POW(10, 12) * 6.25 as daily_cost_usd,
-                COUNT(DISTINCT user_email) as active_users,
-                SUM(CASE WHEN user_email LIKE '%gserviceaccount.com' THEN 
-                    total_bytes_processed / POW(10, 12) * 6.25 ELSE 0 END) as service_account_cost,
-                SUM(CASE WHEN user_email NOT LIKE '%gserviceaccount.com' THEN 
-                    total_bytes_processed / POW(10, 12) * 6.25 ELSE 0 END) as user_cost
-            FROM `{project_id}.region-us.INFORMATION_SCHEMA.JOBS_BY_PROJECT`
-            WHERE creation_time >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {days_historical} DAY)
-                AND job_type = 'QUERY'
-                AND state = 'DONE'
-                AND error_result IS NULL
-                AND total_bytes_processed IS NOT NULL
-            GROUP BY DATE(creation_time)
-        ),
-        weekly_trends AS (
-            SELECT 
-                EXTRACT(WEEK FROM date) as week_num,
-                AVG(daily_cost_usd) as avg_weekly_cost,
-                AVG(query_count) as avg_weekly_queries,
-                AVG(active_users) as avg_weekly_users
-            FROM daily_costs
-            GROUP BY EXTRACT(WEEK FROM date)
-            ORDER BY week_num
-        )
-        SELECT 
-            dc.*,
-            wt.avg_weekly_cost,
-            -- Calculate growth trends
-            LAG(daily_cost_usd, 7) OVER (ORDER BY date) as cost_week_ago,
-            LAG(daily_cost_usd, 1) OVER (ORDER BY date) as cost_day_ago
-        FROM daily_costs dc
-        LEFT JOIN weekly_trends wt ON EXTRACT(WEEK FROM dc.date) = wt.week_num
-        ORDER BY date
-        """
-        
-        results = list(bq_client.query(query))
-        
-        if not results:
+        model = forecast_models.get(project_id, days_historical)
+        if model is None:
             return json.dumps({
                 "success": False,
                 "error": "No historical data found for forecasting"
             })
         
-        # Calculate trends and growth rates
-        daily_costs = [row.daily_cost_usd for row in results]
-        total_historical_cost = sum(daily_costs)
-        avg_daily_cost = total_historical_cost / len(daily_costs)
-        
-        # Calculate growth rate
-        recent_costs = daily_costs[-7:] if len(daily_costs) >= 7 else daily_costs
-        early_costs = daily_costs[:7] if len(daily_costs) >= 14 else daily_costs[:len(daily_costs)//2]
-        
-        recent_avg = sum(recent_costs) / len(recent_costs)
-        early_avg = sum(early_costs) / len(early_costs)
-        
-        if early_avg > 0:
-            growth_rate = (recent_avg - early_avg) / early_avg
-        else:
-            growth_rate = 0
+        growth_rate = model["growth_rate"]
+        recent_avg = model["recent_avg"]
+        avg_daily_cost = model["avg_daily_cost"]
+        total_historical_cost = model["total_historical_cost"]
         
         # Apply growth assumptions
         if growth_assumptions == "conservative":
@@ -686,7 +571,7 @@ def create_cost_forecast(
         return json.dumps({
             "success": True,
             "historical_analysis": {
-                "days_analyzed": len(results),
+                "days_analyzed": model["days_analyzed"],
                 "total_historical_cost": round(total_historical_cost, 2),
                 "avg_daily_cost": round(avg_daily_cost, 2),
                 "growth_rate_observed": round(growth_rate * 100, 2),
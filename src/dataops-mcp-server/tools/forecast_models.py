@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Cost forecast models fitted from BigQuery spend history.
+
+Fitting scans JOBS_BY_PROJECT, which dominates the cost of a forecast, so
+fitted models are cached per project and history window. Once a model is
+older than FORECAST_MODEL_MAX_AGE it is still served while a background
+thread refits it, so only the first request for a key waits for a fit.
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+from time import monotonic
+
+from bigquery_client import get_bq_client
+
+logger = logging.getLogger(__name__)
+
+ForecastModel = dict[str, float]
+
+# Seconds a fitted model is served before it is refit in the background
+FORECAST_MODEL_MAX_AGE = 24 * 60 * 60
+
+
+def build_forecast_history_sql(project_id: str, days_historical: int) -> str:
+    """Build the daily spend history query a forecast model is fitted from."""
+    return f"""
+    WITH daily_costs AS (
+        SELECT
+            DATE(creation_time) as date,
+            COUNT(*) as query_count,
+            SUM(total_bytes_processed) / POW(10, 12) * 6.25 as daily_cost_usd,
+            COUNT(DISTINCT user_email) as active_users,
+            SUM(CASE WHEN user_email LIKE '%gserviceaccount.com' THEN
+                total_bytes_processed / POW(10, 12) * 6.25 ELSE 0 END) as service_account_cost,
+            SUM(CASE WHEN user_email NOT LIKE '%gserviceaccount.com' THEN
+                total_bytes_processed / POW(10, 12) * 6.25 ELSE 0 END) as user_cost
+        FROM `{project_id}.region-us.INFORMATION_SCHEMA.JOBS_BY_PROJECT`
+        WHERE creation_time >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {days_historical} DAY)
+            AND job_type = 'QUERY'
+            AND state = 'DONE'
+            AND error_result IS NULL
+            AND total_bytes_processed IS NOT NULL
+        GROUP BY DATE(creation_time)
+    ),
+    weekly_trends AS (
+        SELECT
+            EXTRACT(WEEK FROM date) as week_num,
+            AVG(daily_cost_usd) as avg_weekly_cost,
+            AVG(query_count) as avg_weekly_queries,
+            AVG(active_users) as avg_weekly_users
+        FROM daily_costs
+        GROUP BY EXTRACT(WEEK FROM date)
+        ORDER BY week_num
+    )
+    SELECT
+        dc.*,
+        wt.avg_weekly_cost,
+        -- Calculate growth trends
+        LAG(daily_cost_usd, 7) OVER (ORDER BY date) as cost_week_ago,
+        LAG(daily_cost_usd, 1) OVER (ORDER BY date) as cost_day_ago
+    FROM daily_costs dc
+    LEFT JOIN weekly_trends wt ON EXTRACT(WEEK FROM dc.date) = wt.week_num
+    ORDER BY date
+    """
+
+
+def fit_forecast_model(project_id: str, days_historical: int) -> ForecastModel | None:
+    """
+    Fit the cost forecast inputs from the last `days_historical` days of spend.
+
+    Returns None when there is no history to fit.
+    """
+    query = build_forecast_history_sql(project_id, days_historical)
+    results = list(get_bq_client(project_id).query(query).result())
+
+    if not results:
+        return None
+
+    # Calculate trends and growth rates
+    daily_costs = [row.daily_cost_usd for row in results]
+    total_historical_cost = sum(daily_costs)
+    avg_daily_cost = total_historical_cost / len(daily_costs)
+
+    # Calculate growth rate
+    recent_costs = daily_costs[-7:] if len(daily_costs) >= 7 else daily_costs
+    early_costs = daily_costs[:7] if len(daily_costs) >= 14 else daily_costs[:len(daily_costs)//2]
+
+    recent_avg = sum(recent_costs) / len(recent_costs)
+    early_avg = sum(early_costs) / len(early_costs)
+
+    growth_rate = (recent_avg - early_avg) / early_avg if early_avg > 0 else 0
+
+    return {
+        "days_analyzed": len(results),
+        "total_historical_cost": total_historical_cost,
+        "avg_daily_cost": avg_daily_cost,
+        "recent_avg": recent_avg,
+        "growth_rate": growth_rate
+    }
+
+
+class ForecastModelCache:
+    """Fitted forecast models keyed by (project_id, days_historical)."""
+
+    def __init__(self, fit: Callable[[str, int], ForecastModel | None] = fit_forecast_model,
+                 max_age: float = FORECAST_MODEL_MAX_AGE):
+        self._fit = fit
+        self.max_age = max_age
+        self._models: dict[tuple[str, int], tuple[ForecastModel, float]] = {}
+        self._refreshing: set[tuple[str, int]] = set()
+        self._lock = threading.Lock()
+
+    def get(self, project_id: str, days_historical: int) -> ForecastModel | None:
+        """
+        Return the model for a key, fitting it now only on a cold miss.
+
+        A stale model is returned as is, and at most one background refit per
+        key is started to replace it.
+        """
+        key = (project_id, days_historical)
+        with self._lock:
+            cached = self._models.get(key)
+            refresh = (
+                cached is not None
+                and monotonic() - cached[1] >= self.max_age
+                and key not in self._refreshing
+            )
+            if refresh:
+                self._refreshing.add(key)
+
+        if cached is None:
+            return self._refit(key)
+        if refresh:
+            threading.Thread(
+                target=self._refresh, args=(key,), name=f"forecast-refit-{key}", daemon=True
+            ).start()
+        return cached[0]
+
+    def _refit(self, key: tuple[str, int]) -> ForecastModel | None:
+        model = self._fit(*key)
+        if model is not None:
+            with self._lock:
+                self._models[key] = (model, monotonic())
+        return model
+
+    def _refresh(self, key: tuple[str, int]) -> None:
+        try:
+            self._refit(key)
+        except Exception:
+            # The stale model keeps being served; the next request retries
+            logger.exception("Background refit of forecast model %s failed", key)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+# Shared by every forecast request in the process
+forecast_models = ForecastModelCache()
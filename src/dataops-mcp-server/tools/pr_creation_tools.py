@@ -9,6 +9,7 @@ import json
 import logging
 import os
 from datetime import datetime
+from functools import cache
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 
@@ -17,6 +18,23 @@ from github.Repository import Repository
 
 logger = logging.getLogger(__name__)
 
+
+@cache
+def get_github_client(token: str) -> Github:
+    """
+    Return the shared Github client for a token.
+    
+    The client keeps its HTTP session open, so every tool instance reuses the
+    same connections instead of repeating the TLS handshake.
+    """
+    return Github(token)
+
+
+@cache
+def get_github_repository(token: str, repo_name: str) -> Repository:
+    """Return the shared repository handle, looked up once per token and name"""
+    return get_github_client(token).get_repo(repo_name)
+
 @dataclass
 class PRCreationResult:
     """GitHub PR creation result"""
@@ -43,16 +61,16 @@ class CreateOptimizationPRTool:
         github_token = os.getenv('GITHUB_TOKEN')
         if github_token:
             try:
-                self.github_client = Github(github_token)
+                self.github_client = get_github_client(github_token)
                 
                 # Default repository configuration
                 repo_name = os.getenv('GITHUB_REPOSITORY', 'quantium/data-platform')
-                self.repository = self.github_client.get_repo(repo_name)
+                self.repository = get_github_repository(github_token, repo_name)
                 
-                logger.info(f"GitHub client initialized for repository: {repo_name}")
+                logger.info("GitHub client initialized for repository: %s", repo_name)
                 
             except Exception as e:
-                logger.error(f"Failed to initialize GitHub client: {e}")
+                logger.error("Failed to initialize GitHub client: %s", e)
         else:
             logger.warning("GitHub token not found - PR creation will not be available")
         
@@ -93,7 +111,7 @@ class CreateOptimizationPRTool:
             JSON string with PR creation result
         """
         try:
-            logger.info(f"Creating optimization PR for optimization ID: {optimization_id}")
+            logger.info("Creating optimization PR for optimization ID: %s", optimization_id)
             
             if not self.github_client:
                 raise ValueError("GitHub integration not configured - missing GITHUB_TOKEN")
@@ -167,12 +185,12 @@ class CreateOptimizationPRTool:
                 }
             }
             
-            logger.info(f"PR created successfully: #{result.pr_number} with ${estimated_savings:.2f} estimated savings")
+            logger.info("PR created successfully: #%s with $%.2f estimated savings", result.pr_number, estimated_savings)
             
             return json.dumps(response, indent=2)
             
         except Exception as e:
-            logger.error(f"PR creation failed: {e}")
+            logger.error("PR creation failed: %s", e)
             return json.dumps({
                 "success": False,
                 "error": str(e),
@@ -246,11 +264,11 @@ class CreateOptimizationPRTool:
                 sha=base_ref.object.sha
             )
             
-            logger.info(f"Created branch: {branch_name}")
+            logger.info("Created branch: %s", branch_name)
             
         except GithubException as e:
             if "already exists" in str(e):
-                logger.warning(f"Branch {branch_name} already exists, using existing branch")
+                logger.warning("Branch %s already exists, using existing branch", branch_name)
             else:
                 raise
     
@@ -324,7 +342,7 @@ class CreateOptimizationPRTool:
                         branch=branch_name
                     )
                     created_files.append(file_path)
-                    logger.info(f"Created file: {file_path}")
+                    logger.info("Created file: %s", file_path)
                 
                 elif operation == "update":
                     # Update existing file
@@ -338,7 +356,7 @@ class CreateOptimizationPRTool:
                             branch=branch_name
                         )
                         created_files.append(file_path)
-                        logger.info(f"Updated file: {file_path}")
+                        logger.info("Updated file: %s", file_path)
                     except:
                         # File doesn't exist, create it
                         self.repository.create_file(
@@ -350,7 +368,7 @@ class CreateOptimizationPRTool:
                         created_files.append(file_path)
                 
             except Exception as e:
-                logger.error(f"Failed to create/update file {file_path}: {e}")
+                logger.error("Failed to create/update file %s: %s", file_path, e)
                 # Continue with other files
         
         return created_files
@@ -381,7 +399,7 @@ class CreateOptimizationPRTool:
             base=base_branch
         )
         
-        logger.info(f"Created PR #{pr.number}: {title}")
+        logger.info("Created PR #%s: %s", pr.number, title)
         
         return {
             "pr": pr,
@@ -715,11 +733,11 @@ If issues are detected:
             if actual_reviewers:
                 pr.create_review_request(reviewers=actual_reviewers)
             
-            logger.info(f"Assigned reviewers: {unique_reviewers}")
+            logger.info("Assigned reviewers: %s", unique_reviewers)
             return unique_reviewers
             
         except Exception as e:
-            logger.error(f"Failed to assign reviewers: {e}")
+            logger.error("Failed to assign reviewers: %s", e)
             return []
     
     async def _apply_labels(self, pr, optimization_data: Dict[str, Any]) -> List[str]:
@@ -753,11 +771,11 @@ If issues are detected:
             # Apply labels
             pr.set_labels(*labels)
             
-            logger.info(f"Applied labels: {labels}")
+            logger.info("Applied labels: %s", labels)
             return labels
             
         except Exception as e:
-            logger.error(f"Failed to apply labels: {e}")
+            logger.error("Failed to apply labels: %s", e)
             return []
     
     def _get_risk_description(self, risk_level: str) -> str:
@@ -783,5 +801,5 @@ If issues are detected:
             return True
             
         except Exception as e:
-            logger.error(f"GitHub integration health check failed: {e}")
+            logger.error("GitHub integration health check failed: %s", e)
             return False
@@ -0,0 +1,13 @@
+"""Shared test setup: make the repo's top-level packages importable."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SERVER_DIR = ROOT / "src" / "dataops-mcp-server"
+
+# Appended rather than prepended: the server and tools directories contain a
+# types.py that must not shadow the standard library module.
+for path in (ROOT, ROOT / "src", SERVER_DIR, SERVER_DIR / "tools"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
@@ -0,0 +1,93 @@
+"""Tests for the shared query helpers in tools/bigquery_client.py."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.cloud.bigquery")
+
+import bigquery_client  # noqa: E402
+
+
+def expensive_query_row(job_id, cost_usd, query_text="SELECT 1"):
+    """A JOBS_BY_PROJECT row shaped like the expensive-queries SQL output."""
+    return SimpleNamespace(
+        job_id=job_id,
+        user_email="analyst@example.com",
+        creation_time=datetime(2024, 1, 2, 3, 4, 5),
+        cost_usd=cost_usd,
+        duration_ms=1200,
+        avg_slots=3.14159,
+        cost_driver_type="DATA_VOLUME_HEAVY",
+        usage_pattern="AD_HOC_ANALYSIS",
+        optimization_category="COLUMN_PRUNING",
+        target_dataset="analytics",
+        target_table="daily",
+        cache_hit=False,
+        query_text=query_text,
+    )
+
+
+class FakeQueryJob:
+    def __init__(self, rows):
+        self.rows = rows
+        self.result_kwargs = None
+
+    def result(self, **kwargs):
+        self.result_kwargs = kwargs
+        return iter(self.rows[:kwargs.get("max_results")])
+
+
+class FakeBigQueryClient:
+    """Records submitted SQL and answers every query with the same rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+        self.jobs = []
+
+    def query(self, sql):
+        self.queries.append(sql)
+        self.jobs.append(FakeQueryJob(self.rows))
+        return self.jobs[-1]
+
+
+@pytest.fixture
+def fake_bq(monkeypatch):
+    fake = FakeBigQueryClient([expensive_query_row("job-1", 42.123), expensive_query_row("job-2", 12.5)])
+    monkeypatch.setattr(bigquery_client, "get_bq_client", lambda _project_id: fake)
+    return fake
+
+
+def test_build_expensive_queries_sql_pushes_filters_and_limit_down():
+    sql = bigquery_client.build_expensive_queries_sql("my-project", 14, 2.5, limit=25.0)
+
+    assert "`my-project.region-us.INFORMATION_SCHEMA.JOBS_BY_PROJECT`" in sql
+    assert "INTERVAL 14 DAY" in sql
+    assert "* 6.25 >= 2.5" in sql
+    assert sql.rstrip().endswith("ORDER BY cost_usd DESC\n    LIMIT 25")
+
+
+def test_expensive_query_entry_formats_a_row():
+    entry = bigquery_client.expensive_query_entry(expensive_query_row("job-1", 42.126, "x" * 600))
+
+    assert entry["cost_usd"] == 42.13
+    assert entry["avg_slots"] == 3.14
+    assert entry["creation_time"] == "2024-01-02T03:04:05"
+    assert entry["target_table"] == "analytics.daily"
+    assert entry["query_preview"] == "x" * 500 + "..."
+
+
+def test_iter_expensive_queries_pages_through_the_project_jobs(fake_bq):
+    rows = bigquery_client.iter_expensive_queries("other-project", days=3, page_size=50, limit=1)
+
+    assert fake_bq.queries == []  # nothing runs until the first row is requested
+    assert [row["job_id"] for row in rows] == ["job-1"]
+    assert "`other-project.region-us" in fake_bq.queries[0]
+    assert fake_bq.jobs[0].result_kwargs == {"page_size": 50, "max_results": 1}
+
+
+def test_iter_expensive_queries_rejects_out_of_range_days(fake_bq):
+    with pytest.raises(ValueError, match="between 1 and 30"):
+        next(bigquery_client.iter_expensive_queries("p", days=31))
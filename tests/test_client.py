@@ -0,0 +1,253 @@
+"""Tests for the command-line client in src/client.py."""
+
+import argparse
+import io
+import json
+import os
+
+import pytest
+
+import client
+
+
+def test_profile_imports_passes_output_through_and_ranks_imports(capfd):
+    status = client._profile_imports(["--version"])
+
+    out = capfd.readouterr().out
+    assert status == 0
+    assert out.startswith("client.py ")
+    assert f"Top {client._PROFILE_TOP_N} imports by cumulative time" in out
+
+    rows = out.split("module\n", 1)[1].splitlines()
+    assert 0 < len(rows) <= client._PROFILE_TOP_N
+    cumulative = [int(row.split()[0]) for row in rows]
+    assert cumulative == sorted(cumulative, reverse=True)
+
+
+def test_profile_imports_returns_the_command_exit_status(capfd):
+    assert client._profile_imports(["no-such-tool"]) == 2
+    assert "unknown tool 'no-such-tool'" in capfd.readouterr().err
+
+
+def test_requested_tool_skips_global_options_and_their_values():
+    assert client._requested_tool(["--project", "costs", "--quiet", "top-users"]) == "top-users"
+    assert client._requested_tool(["--cache-ttl", "60", "costs", "--days", "3"]) == "costs"
+    assert client._requested_tool(["--quiet", "--project", "p"]) is None
+
+
+def test_parse_command_returns_args_and_handler():
+    args, handler = client._parse_command("costs", ["--project", "p", "costs", "--days", "3"])
+
+    assert handler is client.run_get_costs
+    assert (args.tool, args.project, args.days, args.details) == ("costs", "p", 3, False)
+
+
+def test_parse_command_returns_none_for_an_unknown_tool():
+    assert client._parse_command("no-such-tool", ["no-such-tool"]) is None
+
+
+def _add_fake_tool(name):
+    def register(subparsers):
+        subparsers.add_parser(name).add_argument("--fail", action="store_true")
+    return register
+
+
+async def _async_handler(args):
+    return not args.fail
+
+
+@pytest.fixture
+def fake_commands(monkeypatch):
+    monkeypatch.setattr(client, "_COMMANDS", {
+        "sync-tool": (_add_fake_tool("sync-tool"), lambda args: False if args.fail else None),
+        "async-tool": (_add_fake_tool("async-tool"), _async_handler),
+        "broken-tool": (_add_fake_tool("broken-tool"), lambda _args: 1 / 0),
+        "batch": (client._add_batch, client.run_batch),
+    })
+    monkeypatch.delenv("DATAOPS_DAEMON", raising=False)
+
+
+def _run_batch(monkeypatch, capsys, lines):
+    monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(lines)))
+    args = argparse.Namespace(tools=None, project="p", cache_ttl=300, quiet=False,
+                              no_cache=False, long_running=False)
+    ok = client.run_batch(args)
+    statuses = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return ok, statuses
+
+
+def test_dispatch_reports_failure_only_for_false(fake_commands):
+    for argv, expected in [
+        (["sync-tool"], True),
+        (["sync-tool", "--fail"], False),
+        (["async-tool"], True),
+        (["async-tool", "--fail"], False),
+    ]:
+        assert client._dispatch(*client._parse_command(argv[0], argv)) is expected
+
+
+def test_batch_reports_each_command_outcome(fake_commands, monkeypatch, capsys):
+    ok, statuses = _run_batch(monkeypatch, capsys, [
+        "sync-tool",
+        "# comment",
+        "",
+        "async-tool --fail",
+        "broken-tool",
+        "no-such-tool",
+        "sync-tool --bogus",
+        "batch",
+    ])
+
+    assert not ok
+    assert [(s["command"], s["success"], s.get("error")) for s in statuses] == [
+        ("sync-tool", True, None),
+        ("async-tool --fail", False, "command failed"),
+        ("broken-tool", False, "division by zero"),
+        ("no-such-tool", False, client._unknown_tool_message("no-such-tool")),
+        ("sync-tool --bogus", False, "invalid arguments"),
+        ("batch", False, "expected a tool name"),
+    ]
+
+
+def test_batch_rejects_a_per_command_project(fake_commands, monkeypatch, capsys):
+    ok, statuses = _run_batch(monkeypatch, capsys, ["--project other sync-tool", "--project p async-tool"])
+
+    assert not ok
+    assert statuses[0]["error"] == "--project applies to the whole batch, not a single command"
+    assert statuses[1]["success"]
+
+
+def test_batch_succeeds_when_every_command_does(fake_commands, monkeypatch, capsys):
+    ok, statuses = _run_batch(monkeypatch, capsys, ["sync-tool", "async-tool"])
+
+    assert ok
+    assert all(status["success"] for status in statuses)
+
+
+@pytest.mark.parametrize("argv", [[], ["--help"], ["--quiet"], ["--project", "p"]])
+def test_main_without_a_tool_prints_usage(monkeypatch, capsys, argv):
+    monkeypatch.setattr("sys.argv", ["client.py", *argv])
+    client.main()
+    assert capsys.readouterr().out == client._USAGE
+
+
+def test_main_prints_the_version(monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["client.py", "--quiet", "--version"])
+    client.main()
+    assert capsys.readouterr().out.startswith("client.py ")
+
+
+@pytest.mark.parametrize("argv", [["--bogus"], ["--project"], ["--cache-ttl", "soon"], ["--version", "--bogus"]])
+def test_main_rejects_bad_global_options(monkeypatch, capsys, argv):
+    monkeypatch.setattr("sys.argv", ["client.py", *argv])
+    with pytest.raises(SystemExit) as exc:
+        client.main()
+    assert exc.value.code == 2
+    assert "error:" in capsys.readouterr().err
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setattr(client, "_CACHE_DIR", str(path))
+    return path
+
+
+def test_result_cache_files_are_private_and_not_named_after_the_project(cache_dir):
+    path = client._cache_path("../../etc/proj", "mod.func", {"days": 7})
+    client._cache_put(path, '{"success": true}')
+
+    assert os.path.dirname(path) == str(cache_dir)
+    assert "proj" not in os.path.basename(path)
+    assert client._cache_get(path, ttl=60) == '{"success": true}'
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    assert os.listdir(cache_dir) == [os.path.basename(path)]
+
+
+@pytest.mark.parametrize("contents", ['["a list"]', "42", '"text"', "{}", '{"ts": "now", "value": 1}', "{not json"])
+def test_result_cache_treats_malformed_entries_as_a_miss(cache_dir, contents):
+    cache_dir.mkdir()
+    path = cache_dir / "entry.json"
+    path.write_text(contents)
+
+    assert client._cache_get(str(path), ttl=60) is None
+
+
+def test_expensive_queries_stream_writes_json_lines(monkeypatch, capsys):
+    pytest.importorskip("google.cloud.bigquery")
+    import bigquery_client
+
+    from tests.test_bigquery_client import FakeBigQueryClient, expensive_query_row
+
+    fake = FakeBigQueryClient([expensive_query_row("job-1", 42.0), expensive_query_row("job-2", 12.0)])
+    monkeypatch.setattr(bigquery_client, "get_bq_client", lambda _project_id: fake)
+    monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", "unused")
+    monkeypatch.setattr("sys.argv", [
+        "client.py", "--quiet", "--project", "stream-project",
+        "expensive-queries", "--stream", "--days", "3", "--min-cost", "1.5",
+    ])
+
+    client.main()
+
+    out = capsys.readouterr().out
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [row["job_id"] for row in rows] == ["job-1", "job-2"]
+    assert "`stream-project.region-us" in fake.queries[0]
+    assert "INTERVAL 3 DAY" in fake.queries[0]
+    assert ">= 1.5" in fake.queries[0]
+
+
+def _parallel_report(argv):
+    return client._parse_command("optimization-report", [
+        "--quiet", "--project", "p", "optimization-report", "--parallel", *argv,
+    ])
+
+
+def test_parallel_report_sections_use_each_tools_cli_defaults():
+    args, _ = _parallel_report(["--days", "14"])
+    kwargs = {
+        name: spec.kwargs(client._section_args(args, tool))
+        for name, tool, spec in client._REPORT_SECTIONS
+    }
+
+    assert kwargs["expensive_queries"] == {
+        "project_id": "p", "days": 14, "min_cost_threshold": 10.0, "categorize_by": "cost_driver",
+    }
+    assert kwargs["table_hotspots"] == {"project_id": "p", "days": 14, "min_access_cost": 5.0}
+    assert kwargs["optimization_patterns"] == {"project_id": "p", "days": 14, "min_cost_threshold": 5.0}
+    assert kwargs["materialized_views"] == {
+        "project_id": "p", "days": 14, "min_repetition_count": 3, "min_cost_per_execution": 5.0,
+    }
+
+
+def test_parallel_report_combines_sections(monkeypatch, capsys):
+    def fake_call_tool(args, module, func, **kwargs):
+        if func == "analyze_table_hotspots":
+            raise RuntimeError("quota exceeded")
+        return json.dumps({"success": True, "func": func, "days": kwargs["days"]})
+
+    monkeypatch.setattr(client, "_call_tool", fake_call_tool)
+
+    assert client._dispatch(*_parallel_report(["--days", "3"])) is False
+    report = json.loads(capsys.readouterr().out)
+
+    assert set(report) == {"project_id", "days", "sections"}
+    assert (report["project_id"], report["days"]) == ("p", 3)
+    assert report["sections"]["expensive_queries"] == {
+        "success": True, "func": "analyze_expensive_queries", "days": 3,
+    }
+    assert report["sections"]["table_hotspots"] == {
+        "success": False, "error": "Failed to analyze table hotspots: quota exceeded",
+    }
+    assert list(report["sections"]) == [name for name, _, _ in client._REPORT_SECTIONS]
+
+
+def test_parallel_report_rejects_a_report_type(capsys):
+    assert client._dispatch(*_parallel_report(["--report-type", "technical"])) is False
+    assert "cannot be used with --parallel" in capsys.readouterr().out
+
+
+def test_sequential_report_defaults_to_the_executive_report():
+    args, _ = client._parse_command("optimization-report", ["optimization-report"])
+    assert client.OPTIMIZATION_REPORT.kwargs(args)["report_type"] == "executive"
@@ -0,0 +1,80 @@
+"""Tests for the anomaly scoring helpers in tools/cost_intelligence_engine.py."""
+
+import importlib
+
+import numpy as np
+import pytest
+
+pytest.importorskip("google.cloud.bigquery")
+
+import bigquery_client  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def engine():
+    # The module builds a shared engine, and so a BigQuery client, on import
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("GOOGLE_CLOUD_PROJECT", "test-project")
+        mp.setattr(bigquery_client, "get_bq_client", lambda _project_id: None)
+        return importlib.import_module("cost_intelligence_engine")
+
+
+def naive_rolling_zscores(costs, window):
+    """Reference implementation: one mean and sample std per trailing window."""
+    zscores = np.full(len(costs), np.nan)
+    if window < 2:
+        return zscores
+    tolerance = 1e-9 * max(float(np.abs(costs).max()), 1.0) if len(costs) else 0.0
+    for i in range(window, len(costs)):
+        baseline = costs[i - window:i]
+        std = baseline.std(ddof=1)
+        if std > tolerance:
+            zscores[i] = (costs[i] - baseline.mean()) / std
+    return zscores
+
+
+@pytest.mark.parametrize("offset", [0.0, 1e6])
+def test_rolling_zscores_match_naive_windows(engine, offset):
+    rng = np.random.default_rng(7)
+    costs = offset + rng.gamma(2.0, 50.0, size=120)
+    costs[60] += 2000.0  # a spike, so some z-scores are large
+    windows = [2, 3, 7, 30, 119]
+
+    for window, zscores in zip(windows, engine.rolling_zscores(costs, windows), strict=True):
+        np.testing.assert_allclose(
+            zscores, naive_rolling_zscores(costs, window), rtol=1e-6, atol=1e-9, equal_nan=True
+        )
+
+
+def test_rolling_zscores_leave_short_and_flat_baselines_unscored(engine):
+    costs = np.array([5.0, 5.0, 5.0, 5.0, 9.0, 1.0, 4.0])
+
+    short, flat, too_long, degenerate = engine.rolling_zscores(costs, [3, 4, 7, 1])
+
+    assert np.isnan(short[:3]).all()
+    assert np.isnan(short[3])  # baseline 5, 5, 5 has zero variance
+    np.testing.assert_allclose(short, naive_rolling_zscores(costs, 3), equal_nan=True)
+    assert np.isnan(flat[4]) and not np.isnan(flat[5])
+    assert np.isnan(too_long).all()
+    assert np.isnan(degenerate).all()
+
+
+def test_rolling_zscores_of_an_empty_series(engine):
+    (zscores,) = engine.rolling_zscores(np.array([]), [7])
+    assert zscores.shape == (0,)
+
+
+@pytest.mark.parametrize(
+    ("z_score", "severity"),
+    [
+        (2.1, "MEDIUM"),
+        (3.0, "MEDIUM"),  # exactly 1.5x the threshold
+        (3.01, "HIGH"),
+        (5.0, "HIGH"),  # exactly 2.5x the threshold
+        (5.01, "CRITICAL"),
+        (-3.5, "HIGH"),
+        (-40.0, "CRITICAL"),
+    ],
+)
+def test_severity_for_zscore_breaks_at_multiples_of_the_threshold(engine, z_score, severity):
+    assert engine.severity_for_zscore(z_score, threshold=2.0) == severity
@@ -0,0 +1,122 @@
+"""Tests for the cached cost forecast models in tools/forecast_models.py."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.cloud.bigquery")
+
+import forecast_models  # noqa: E402
+from forecast_models import ForecastModelCache  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(forecast_models, "monotonic", fake)
+    return fake
+
+
+class FakeFit:
+    """Fit stub returning a numbered model; can be held open or made to fail."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+        self.fail = False
+
+    def __call__(self, project_id, days_historical):
+        self.calls.append((project_id, days_historical))
+        assert self.release.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError("BigQuery unavailable")
+        return {"version": len(self.calls)}
+
+
+def wait_for_refits():
+    for thread in threading.enumerate():
+        if thread.name.startswith("forecast-refit-"):
+            thread.join(timeout=5)
+
+
+def test_cold_miss_fits_synchronously_and_caches(clock):
+    fit = FakeFit()
+    cache = ForecastModelCache(fit, max_age=60)
+
+    assert cache.get("p", 30) == {"version": 1}
+    clock.now += 59
+    assert cache.get("p", 30) == {"version": 1}
+    assert cache.get("p", 7) == {"version": 2}
+    assert cache.get("q", 30) == {"version": 3}
+    assert fit.calls == [("p", 30), ("p", 7), ("q", 30)]
+
+
+def test_stale_model_is_served_while_it_refits_in_the_background(clock):
+    fit = FakeFit()
+    cache = ForecastModelCache(fit, max_age=60)
+    cache.get("p", 30)
+
+    clock.now += 60
+    fit.release.clear()
+    assert cache.get("p", 30) == {"version": 1}  # does not wait for the refit
+    assert cache.get("p", 30) == {"version": 1}  # and starts no second refit
+
+    fit.release.set()
+    wait_for_refits()
+    assert cache.get("p", 30) == {"version": 2}
+    assert len(fit.calls) == 2
+
+
+def test_failed_refit_keeps_the_stale_model(clock, caplog):
+    fit = FakeFit()
+    cache = ForecastModelCache(fit, max_age=60)
+    cache.get("p", 30)
+
+    clock.now += 60
+    fit.fail = True
+    assert cache.get("p", 30) == {"version": 1}
+    wait_for_refits()
+    assert "Background refit of forecast model ('p', 30) failed" in caplog.text
+
+    fit.fail = False
+    assert cache.get("p", 30) == {"version": 1}  # retries in the background
+    wait_for_refits()
+    assert cache.get("p", 30) == {"version": 3}
+
+
+def test_fit_forecast_model_from_daily_costs(monkeypatch):
+    costs = [10.0] * 7 + [5.0] * 7 + [20.0] * 7
+    rows = [SimpleNamespace(daily_cost_usd=cost) for cost in costs]
+    queries = []
+
+    class FakeClient:
+        def query(self, sql):
+            queries.append(sql)
+            return SimpleNamespace(result=lambda: iter(rows))
+
+    monkeypatch.setattr(forecast_models, "get_bq_client", lambda _project_id: FakeClient())
+
+    model = forecast_models.fit_forecast_model("my-project", 21)
+
+    assert "`my-project.region-us" in queries[0]
+    assert "INTERVAL 21 DAY" in queries[0]
+    assert model == {
+        "days_analyzed": 21,
+        "total_historical_cost": 245.0,
+        "avg_daily_cost": pytest.approx(245.0 / 21),
+        "recent_avg": 20.0,
+        "growth_rate": 1.0,
+    }
+
+    rows.clear()
+    assert forecast_models.fit_forecast_model("my-project", 21) is None
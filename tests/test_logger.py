@@ -0,0 +1,23 @@
+"""Tests for the server logging setup in src/dataops-mcp-server/logger.py."""
+
+import importlib.util
+import logging
+
+import pytest
+
+from tests.conftest import SERVER_DIR
+
+pytest.importorskip("structlog")
+
+
+@pytest.fixture(scope="module")
+def server_logger():
+    # Loaded by path: src/logger.py shadows the server's logger module on sys.path
+    spec = importlib.util.spec_from_file_location("server_logger", SERVER_DIR / "logger.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_level_map_accepts_every_standard_level_name(server_logger):
+    assert logging.getLevelNamesMapping() == server_logger._LEVEL_MAP
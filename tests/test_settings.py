@@ -0,0 +1,82 @@
+"""Tests for the on-disk settings cache in config.settings."""
+
+import json
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from config import settings as settings_module  # noqa: E402
+
+FAKE_TOKEN = "ghp_secret123"  # noqa: S105
+OTHER_TOKEN = "ghp_other456"  # noqa: S105
+
+
+@pytest.fixture
+def env_dir(tmp_path, monkeypatch):
+    """A working directory with a .env file and a private cache directory."""
+    (tmp_path / ".env").write_text(
+        'PROJECT={"id": "test-project", "region": "us"}\n'
+        "GOOGLE_APPLICATION_CREDENTIALS=/tmp/creds.json\n"
+        f"GITHUB_TOKEN={FAKE_TOKEN}\n"
+        "SOME_EXTRA_SECRET=extra-value\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    for name in ("GITHUB_TOKEN", "SLACK_WEBHOOK_URL", "CLAUDE_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    settings_module.get_settings.cache_clear()
+    yield tmp_path
+    settings_module.get_settings.cache_clear()
+
+
+def test_deferred_secret_resolves_on_cold_and_warm_start(env_dir):
+    cold = settings_module.get_settings()
+    assert cold.GITHUB_TOKEN == FAKE_TOKEN
+    assert settings_module._cached_settings_path().exists()
+
+    settings_module.get_settings.cache_clear()
+    warm = settings_module.get_settings()
+    assert warm is not cold
+    assert warm.project.id == "test-project"
+    assert warm.GITHUB_TOKEN == FAKE_TOKEN
+
+
+def test_cache_file_holds_no_secrets_and_is_private(env_dir):
+    settings_module.get_settings()
+    cache_path = settings_module._cached_settings_path()
+
+    contents = cache_path.read_text()
+    assert FAKE_TOKEN not in contents
+    assert "extra-value" not in contents
+    assert set(json.loads(contents)) <= set(settings_module.Settings.model_fields)
+    assert cache_path.stat().st_mode & 0o777 == 0o600
+    assert cache_path.parent.stat().st_mode & 0o777 == 0o700
+
+
+def test_deferred_secrets_are_not_read_at_construction(env_dir, monkeypatch):
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", "https://hooks.example.com/abc")
+    settings = settings_module.Settings()
+
+    extras = {key.lower() for key in settings.model_extra or {}}
+    assert not extras & {"github_token", "slack_webhook_url", "claude_api_key"}
+    assert "some_extra_secret" in extras
+    assert settings.GITHUB_TOKEN == FAKE_TOKEN
+    assert settings.SLACK_WEBHOOK_URL == "https://hooks.example.com/abc"
+
+
+def test_each_instance_resolves_secrets_from_its_own_sources(env_dir):
+    other_env = env_dir / "other.env"
+    other_env.write_text(
+        'PROJECT={"id": "other-project", "region": "us"}\n'
+        "GOOGLE_APPLICATION_CREDENTIALS=/tmp/other.json\n"
+        f"GITHUB_TOKEN={OTHER_TOKEN}\n"
+    )
+
+    first = settings_module.Settings()
+    second = settings_module.Settings(_env_file=other_env)
+    warm = settings_module._settings_from_cache(first.model_dump(mode="json"))
+
+    assert first.GITHUB_TOKEN == FAKE_TOKEN
+    assert second.GITHUB_TOKEN == OTHER_TOKEN
+    assert warm.GITHUB_TOKEN == FAKE_TOKEN
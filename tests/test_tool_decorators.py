@@ -0,0 +1,427 @@
+"""Tests for the tool decorators in src/dataops-mcp-server/tool_decorators.py."""
+
+import asyncio
+import json
+
+import pytest
+import tool_decorators
+from tool_decorators import (
+    TTLCache,
+    detect_antipatterns,
+    merge_alerts,
+    with_alert_batching,
+    with_antipattern_gate,
+    with_result_cache,
+)
+
+
+class FakeClock:
+    """Stands in for time.monotonic so TTL expiry can be stepped manually."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(tool_decorators, "monotonic", fake)
+    return fake
+
+
+class CountingTool:
+    """Async tool stub that records its calls and can be held open by a test."""
+
+    __name__ = "counting_tool"
+
+    def __init__(self, fail=False, results=()):
+        self.calls = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.fail = fail
+        self.results = list(results)
+
+    async def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("tool failed")
+        if self.results:
+            return self.results.pop(0)
+        return f"result-{len(self.calls)}"
+
+
+# ============================================================================
+# TTLCache
+# ============================================================================
+
+def test_ttl_cache_entries_expire_after_ttl(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.put("a", 1)
+
+    clock.now += 10
+    assert cache.get("a") == 1
+
+    clock.now += 0.001
+    assert cache.get("a") is None
+    assert "a" not in cache._entries
+
+
+def test_ttl_cache_evicts_least_recently_used(clock):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+# ============================================================================
+# with_result_cache
+# ============================================================================
+
+async def test_result_cache_reuses_result_until_ttl_expires(clock):
+    tool = CountingTool()
+    cached = with_result_cache("sql", ttl=60)(tool)
+
+    assert await cached(sql="SELECT 1") == "result-1"
+    assert await cached(sql="SELECT 1") == "result-1"
+    assert len(tool.calls) == 1
+
+    clock.now += 61
+    assert await cached(sql="SELECT 1") == "result-2"
+    assert len(tool.calls) == 2
+
+
+async def test_result_cache_key_normalizes_sql_and_applies_defaults(clock):
+    tool = CountingTool()
+    cached = with_result_cache("sql", key_defaults={"project_id": "default-project"})(tool)
+
+    await cached(sql="SELECT  a\n FROM t;", project_id=None)
+    await cached(sql="SELECT a FROM t", project_id="default-project")
+    assert len(tool.calls) == 1
+
+    await cached(sql="SELECT a FROM t", project_id="other-project")
+    await cached(sql="SELECT 'a  b' FROM t")
+    await cached(sql="SELECT 'a b' FROM t")
+    assert len(tool.calls) == 4  # whitespace inside string literals is significant
+
+
+async def test_result_cache_skips_uncacheable_calls(clock):
+    tool = CountingTool()
+    cached = with_result_cache("sql", side_effect_args=("create_pr",))(tool)
+
+    await cached(sql="")
+    await cached(sql="")
+    await cached(sql="SELECT 1", create_pr=True)
+    await cached(sql="SELECT 1", create_pr=True)
+    assert len(tool.calls) == 4
+
+    await cached(sql="SELECT 1")
+    await cached(sql="SELECT 1", cache_bypass=True)
+    assert len(tool.calls) == 6
+    assert all("cache_bypass" not in call for call in tool.calls)
+
+
+async def test_result_cache_does_not_cache_errors(clock):
+    tool = CountingTool(fail=True)
+    cached = with_result_cache("sql")(tool)
+
+    with pytest.raises(RuntimeError):
+        await cached(sql="SELECT 1")
+    tool.fail = False
+    assert await cached(sql="SELECT 1") == "result-2"
+
+
+async def test_result_cache_does_not_cache_error_responses(clock):
+    failed = json.dumps({"success": False, "error": "quota exceeded"})
+    errored = json.dumps({"error": "timeout"})
+    ok = json.dumps({"success": True, "bytes_processed": 10})
+    tool = CountingTool(results=[failed, errored, ok])
+    cached = with_result_cache("sql")(tool)
+
+    assert await cached(sql="SELECT 1") == failed
+    assert await cached(sql="SELECT 1") == errored
+    assert await cached(sql="SELECT 1") == ok
+    assert await cached(sql="SELECT 1") == ok
+    assert len(tool.calls) == 3
+
+
+async def test_result_cache_coalesces_concurrent_misses(clock):
+    tool = CountingTool()
+    tool.release.clear()
+    cached = with_result_cache("sql")(tool)
+
+    callers = [asyncio.create_task(cached(sql="SELECT 1")) for _ in range(5)]
+    await asyncio.sleep(0)
+    tool.release.set()
+
+    assert await asyncio.gather(*callers) == ["result-1"] * 5
+    assert len(tool.calls) == 1
+
+
+async def test_result_cache_coalesced_error_response_is_not_cached(clock):
+    # Shaped like get_dbt_model_costs, which is cached on model_path
+    failed = json.dumps({"success": False, "error": "dbt manifest not found"})
+    ok = json.dumps({"success": True, "models": []})
+    tool = CountingTool(results=[failed, ok])
+    tool.release.clear()
+    cached = with_result_cache("model_path")(tool)
+
+    callers = [asyncio.create_task(cached(model_path="models/orders.sql", days=7)) for _ in range(3)]
+    await asyncio.sleep(0)
+    tool.release.set()
+
+    assert await asyncio.gather(*callers) == [failed] * 3
+    assert len(tool.calls) == 1
+
+    assert await cached(model_path="models/orders.sql", days=7) == ok
+    assert await cached(model_path="models/orders.sql", days=7) == ok
+    assert len(tool.calls) == 2
+
+
+async def test_result_cache_cancelled_caller_does_not_cancel_shared_call(clock):
+    tool = CountingTool()
+    tool.release.clear()
+    cached = with_result_cache("sql")(tool)
+
+    first = asyncio.create_task(cached(sql="SELECT 1"))
+    second = asyncio.create_task(cached(sql="SELECT 1"))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    tool.release.set()
+
+    assert await second == "result-1"
+    assert await cached(sql="SELECT 1") == "result-1"
+    assert len(tool.calls) == 1
+
+
+async def test_result_cache_shared_failure_reaches_every_waiter(clock):
+    tool = CountingTool(fail=True)
+    tool.release.clear()
+    cached = with_result_cache("sql")(tool)
+
+    callers = [asyncio.create_task(cached(sql="SELECT 1")) for _ in range(3)]
+    await asyncio.sleep(0)
+    tool.release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(tool.calls) == 1
+
+    # The failed call is no longer in flight, so the next miss retries
+    tool.fail = False
+    assert await cached(sql="SELECT 1") == "result-2"
+
+
+# ============================================================================
+# merge_alerts / with_alert_batching
+# ============================================================================
+
+WINDOW = 0.01
+
+
+def test_merge_alerts_keeps_the_highest_severity_and_every_payload():
+    merged = merge_alerts([
+        {"channel": "#c", "alert_type": "budget", "severity": "medium",
+         "cost_data": {"n": 1}, "mention_users": ("a", "b"), "include_remediation": False},
+        {"channel": "#c", "alert_type": "anomaly", "severity": "high",
+         "cost_data": {"n": 2}, "mention_users": ("b", "c"), "include_remediation": True},
+        {"channel": "#c", "alert_type": "budget", "severity": "low", "cost_data": {"n": 3}},
+    ])
+
+    assert merged["channel"] == "#c"
+    assert merged["alert_type"] == "multiple"
+    assert merged["severity"] == "high"
+    assert merged["mention_users"] == ("a", "b", "c")
+    assert merged["include_remediation"] is True
+    assert [alert["cost_data"] for alert in merged["cost_data"]["alerts"]] == [
+        {"n": 1}, {"n": 2}, {"n": 3},
+    ]
+
+
+def test_merge_alerts_keeps_a_shared_alert_type():
+    merged = merge_alerts([
+        {"alert_type": "budget", "severity": "low"},
+        {"alert_type": "budget", "severity": "unknown"},
+    ])
+
+    assert merged["alert_type"] == "budget"
+    assert merged["severity"] == "low"
+
+
+class RecordingSender:
+    """Async send_cost_alert stub that records what was delivered."""
+
+    def __init__(self, fail=False):
+        self.sent = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.fail = fail
+
+    async def __call__(self, **kwargs):
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("slack is down")
+        self.sent.append(kwargs)
+        return "delivered"
+
+
+def _alert(severity="medium", **kwargs):
+    return {"channel": "#costs", "alert_type": "budget", "severity": severity,
+            "cost_data": {}, **kwargs}
+
+
+async def test_alert_batching_queues_and_flushes_one_merged_alert():
+    sender = RecordingSender()
+    send = with_alert_batching(window=WINDOW)(sender)
+
+    first = json.loads(await send(**_alert()))
+    second = json.loads(await send(**_alert(severity="high")))
+    assert first["queued"] and first["alerts_in_batch"] == 1
+    assert second["alerts_in_batch"] == 2
+    assert sender.sent == []
+
+    await asyncio.sleep(WINDOW * 5)
+    assert len(sender.sent) == 1
+    assert sender.sent[0]["severity"] == "high"
+    assert len(sender.sent[0]["cost_data"]["alerts"]) == 2
+
+
+async def test_alert_batching_delivers_a_lone_alert_unchanged():
+    sender = RecordingSender()
+    send = with_alert_batching(window=WINDOW)(sender)
+
+    await send(**_alert())
+    await asyncio.sleep(WINDOW * 5)
+    assert sender.sent == [_alert()]
+
+
+async def test_alert_batching_batches_per_channel_and_project():
+    sender = RecordingSender()
+    send = with_alert_batching(window=WINDOW)(sender)
+
+    await send(**_alert())
+    await send(**_alert(channel="#other"))
+    await send(**_alert(project_id="p2"))
+    await asyncio.sleep(WINDOW * 5)
+    assert len(sender.sent) == 3
+
+
+async def test_alert_batching_sends_immediate_alerts_without_waiting():
+    sender = RecordingSender()
+    send = with_alert_batching(window=60)(sender)
+
+    assert await send(**_alert(severity="critical")) == "delivered"
+    assert await send(**_alert(), flush_immediately=True) == "delivered"
+    assert len(sender.sent) == 2
+    assert "flush_immediately" not in sender.sent[1]
+
+
+async def test_alert_batching_logs_delivery_failures(caplog):
+    sender = RecordingSender(fail=True)
+    send = with_alert_batching(window=WINDOW)(sender)
+
+    await send(**_alert())
+    await asyncio.sleep(WINDOW * 5)
+    assert "Failed to deliver 1 batched alert(s) to #costs" in caplog.text
+
+
+def _flushers():
+    return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+
+async def test_alert_batching_cancelled_flusher_drops_its_batch(caplog):
+    sender = RecordingSender()
+    send = with_alert_batching(window=60)(sender)
+
+    await send(**_alert())
+    await send(**_alert())
+    (flusher,) = _flushers()
+    flusher.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flusher
+    assert "cancelled; 2 alert(s) may not be delivered" in caplog.text
+
+    # Callers are never left waiting, and the next alert opens a new batch
+    reply = json.loads(await asyncio.wait_for(send(**_alert()), timeout=1))
+    assert reply["alerts_in_batch"] == 1
+    for task in _flushers():
+        task.cancel()
+
+
+async def test_alert_batching_cancel_during_delivery_keeps_the_next_batch():
+    sender = RecordingSender()
+    sender.release.clear()
+    send = with_alert_batching(window=WINDOW)(sender)
+
+    await send(**_alert())
+    await asyncio.sleep(WINDOW * 5)  # first batch is now blocked in delivery
+    (delivering,) = _flushers()
+
+    await send(**_alert(severity="high"))
+    delivering.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await delivering
+    sender.release.set()
+
+    await asyncio.sleep(WINDOW * 5)
+    assert [alert["severity"] for alert in sender.sent] == ["high"]
+
+
+# ============================================================================
+# detect_antipatterns / with_antipattern_gate
+# ============================================================================
+
+FILTERED = "FROM `p.d.t` WHERE _PARTITIONDATE = '2024-01-01'"
+
+
+@pytest.mark.parametrize(
+    ("sql", "expected"),
+    [
+        (f"SELECT a {FILTERED}", []),
+        (f"SELECT a {FILTERED} ORDER BY a LIMIT 10", []),
+        (f"SELECT * {FILTERED}", ["select_star"]),
+        (f"SELECT t.* {FILTERED}", ["select_star"]),
+        ("SELECT a FROM `p.d.t`", ["missing_partition_filter"]),
+        ("SELECT a FROM `p.d.t` WHERE created_at > '2024-01-01'", ["missing_partition_filter"]),
+        ("SELECT _PARTITIONDATE FROM `p.d.t` WHERE a = 1", ["missing_partition_filter"]),
+        (f"SELECT a {FILTERED} ORDER BY a", ["unbounded_order_by"]),
+        (f"SELECT a {FILTERED} AND b IN (SELECT b FROM u)", ["subquery_in_where"]),
+        ("SELECT a FROM t, u WHERE _PARTITIONTIME > '2024-01-01'", ["cross_join"]),
+        ("SELECT a FROM t JOIN u USING (k) WHERE _PARTITIONDATE = '2024-01-01'", ["join"]),
+    ],
+)
+def test_detect_antipatterns(sql, expected):
+    assert detect_antipatterns(sql) == expected
+
+
+async def test_antipattern_gate_returns_clean_sql_unchanged():
+    tool = CountingTool()
+    gated = with_antipattern_gate()(tool)
+    sql = f"SELECT a {FILTERED}"
+
+    reply = json.loads(await gated(sql=sql))
+    assert tool.calls == []
+    assert reply == {
+        "success": True,
+        "original_query": sql,
+        "optimized_query": sql,
+        "estimated_savings_usd": 0.0,
+        "estimated_savings_pct": 0.0,
+        "optimization_techniques": [],
+        "explanation": reply["explanation"],
+        "risk_level": "LOW",
+    }
+
+    assert await gated(sql="SELECT * FROM t") == "result-1"
+    assert len(tool.calls) == 1